@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.6 on 2026-10-18 16:37
+from __future__ import unicode_literals
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_email_hashes(apps, schema_editor):
+    Profile = apps.get_model('accounts', 'Profile')
+
+    for pk, email in Profile.objects.values_list('pk', 'user__email').iterator():
+        email_hash = hashlib.md5(email.lower().encode('utf-8')).hexdigest()
+        Profile.objects.filter(pk=pk).update(email_hash=email_hash)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='email_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.RunPython(fill_email_hashes, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,17 @@
+import hashlib
+
+from django.contrib.auth.models import User
 from django.db import models
 
-# Create your models here.
+
+def hash_email(email):
+    return hashlib.md5(email.lower().encode('utf-8')).hexdigest()
+
+
+class Profile(models.Model):
+    user = models.OneToOneField(User, related_name='profile', on_delete=models.CASCADE)
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    email_hash = models.CharField(max_length=32, blank=True, editable=False)
+
+    def __str__(self):
+        return self.user.username
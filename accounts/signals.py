@@ -0,0 +1,34 @@
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from boards.models import Post
+from .models import Profile, hash_email
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    email_hash = hash_email(instance.email)
+    if created:
+        Profile.objects.get_or_create(user=instance, defaults={'email_hash': email_hash})
+    elif update_fields is None or 'email' in update_fields:
+        # However the email was changed, the admin, a view or a shell. Signing in only saves `last_login`
+        Profile.objects.filter(user=instance).exclude(email_hash=email_hash).update(email_hash=email_hash)
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, **kwargs):
+    if created:
+        updated = Profile.objects.filter(user_id=instance.created_by_id).update(posts_count=F('posts_count') + 1)
+        if not updated:
+            Profile.objects.create(
+                user_id=instance.created_by_id,
+                posts_count=instance.created_by.posts.count(),
+                email_hash=hash_email(instance.created_by.email)
+            )
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    Profile.objects.filter(user_id=instance.created_by_id).update(posts_count=F('posts_count') - 1)
@@ -0,0 +1,31 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from boards.models import Board, Post, Topic
+from ..models import Profile
+
+
+class ProfileTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        board = Board.objects.create(name='Django', description='Django board.')
+        self.topic = Topic.objects.create(subject='Hello, world', board=board, starter=self.user)
+
+    def get_posts_count(self):
+        return Profile.objects.get(user=self.user).posts_count
+
+    def test_profile_is_created_with_the_user(self):
+        self.assertTrue(Profile.objects.filter(user=self.user).exists())
+
+    def test_posts_are_counted(self):
+        post = Post.objects.create(message='Hello', topic=self.topic, created_by=self.user)
+        Post.objects.create(message='Hello again', topic=self.topic, created_by=self.user)
+        self.assertEquals(self.get_posts_count(), 2)
+        post.delete()
+        self.assertEquals(self.get_posts_count(), 1)
+
+    def test_missing_profile_is_created_on_post(self):
+        Post.objects.create(message='Hello', topic=self.topic, created_by=self.user)
+        Profile.objects.all().delete()
+        Post.objects.create(message='Hello again', topic=self.topic, created_by=self.user)
+        self.assertEquals(self.get_posts_count(), 2)
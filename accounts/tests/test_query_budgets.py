@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from boards.tests.utils import query_budget
+
+
+class AccountsQueryBudgetTests(TestCase):
+    """
+        The account pages do not list anything, their budgets have to hold however many users exist.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+
+    def create_users(self, count):
+        for i in range(User.objects.count(), count):
+            User.objects.create_user(username='user{}'.format(i), email='user{}@mail.com'.format(i))
+
+    def assertQueryBudget(self, budget, url, status_code=200):
+        # The first request creates the session, every later one reads it
+        self.client.get(url)
+        for rows in (1, 20):
+            self.create_users(rows)
+            with query_budget(budget):
+                response = self.client.get(url)
+            self.assertEquals(response.status_code, status_code)
+
+    def login(self):
+        self.client.login(username='john', password='test12345')
+
+    def test_signup(self):
+        self.assertQueryBudget(0, reverse('accounts:signup'))
+
+    def test_login(self):
+        self.assertQueryBudget(0, reverse('accounts:login'))
+
+    def test_logout(self):
+        self.assertQueryBudget(0, reverse('accounts:logout'), status_code=302)
+
+    def test_password_reset(self):
+        self.assertQueryBudget(0, reverse('accounts:password_reset'))
+
+    def test_password_reset_done(self):
+        self.assertQueryBudget(0, reverse('accounts:password_reset_done'))
+
+    def test_password_reset_confirm(self):
+        url = reverse('accounts:password_reset_confirm', kwargs={
+            'uidb64': urlsafe_base64_encode(force_bytes(self.user.pk)).decode(),
+            'token': default_token_generator.make_token(self.user)
+        })
+        # The token is moved to the session and the user is redirected to the form
+        set_password_url = self.client.get(url)['Location']
+        self.assertQueryBudget(2, set_password_url)
+
+    def test_password_reset_complete(self):
+        self.assertQueryBudget(0, reverse('accounts:password_reset_complete'))
+
+    def test_password_change(self):
+        self.login()
+        self.assertQueryBudget(2, reverse('accounts:password_change'))
+
+    def test_password_change_done(self):
+        self.login()
+        self.assertQueryBudget(2, reverse('accounts:password_change_done'))
+
+    def test_my_account(self):
+        self.login()
+        self.assertQueryBudget(2, reverse('accounts:my_account'))
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Profile, hash_email
+
+
+class MyAccountEmailTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.client.login(username='john', password='test12345')
+        self.url = reverse('accounts:my_account')
+
+    def get_email_hash(self):
+        return Profile.objects.get(user=self.user).email_hash
+
+    def test_email_hash_is_stored_on_signup(self):
+        self.assertEquals(self.get_email_hash(), hash_email('john@mail.com'))
+
+    def test_email_hash_is_refreshed_on_email_change(self):
+        self.client.post(self.url, {'first_name': 'John', 'last_name': 'Doe', 'email': 'john@doe.com'})
+        self.assertEquals(self.get_email_hash(), hash_email('john@doe.com'))
+
+    def test_email_hash_is_refreshed_on_save(self):
+        self.user.email = 'john@doe.com'
+        self.user.save()
+        self.assertEquals(self.get_email_hash(), hash_email('john@doe.com'))
+
+    def test_sign_in_does_not_update_the_profile(self):
+        # Only the user's own UPDATE
+        with self.assertNumQueries(1):
+            self.user.save(update_fields=['last_login'])
@@ -29,4 +29,4 @@ class UserUpdateView(UpdateView):
     success_url = reverse_lazy('accounts:my_account')
 
     def get_object(self, queryset=None):
-        return self.request.user
\ No newline at end of file
+        return self.request.user
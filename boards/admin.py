@@ -1,15 +1,137 @@
 from django.contrib import admin
-from .models import Board, Topic, Post
+from django.forms.models import BaseInlineFormSet
+from django.utils.text import Truncator
 
+from .models import Board, Topic, Post, QueryFingerprint
 
-class PostInline(admin.StackedInline):
+
+class LatestPostsFormSet(BaseInlineFormSet):
+    limit = 20
+
+    def get_queryset(self):
+        # The newest posts only, a topic can have thousands. Cached, the formset indexes it for every form
+        if not hasattr(self, '_queryset'):
+            self._queryset = self.queryset.select_related('created_by').order_by('-created_at')[:self.limit]
+        return self._queryset
+
+
+class PostInline(admin.TabularInline):
+    """
+        Read only list of the latest posts, each links to its own change page.
+    """
     model = Post
-    extra = 3
+    formset = LatestPostsFormSet
+    fields = ('short_message', 'created_by', 'created_at', 'updated_at')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+    show_change_link = True
+    verbose_name_plural = 'Latest {} posts'.format(LatestPostsFormSet.limit)
+
+    def short_message(self, obj):
+        return str(obj)
+    short_message.short_description = 'Message'
+
+    def has_add_permission(self, request):
+        return False
+
+
+class ExactSearchMixin:
+    """
+        Searches by id or by exact username, both indexed, where the default `icontains` would scan the table.
+    """
+    username_lookup = None
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        if search_term.isdigit():
+            return queryset.filter(pk=search_term), False
+        return queryset.filter(**{self.username_lookup: search_term}), False
+
+
+class BoardAdmin(admin.ModelAdmin):
+    list_display = ('name', 'topics_count', 'posts_count')
+    readonly_fields = ('topics_count', 'posts_count', 'last_post')
 
 
-class TopicAdmin(admin.ModelAdmin):
+class TopicAdmin(ExactSearchMixin, admin.ModelAdmin):
+    """
+        Users are picked by id, a `<select>` would list every user, and the list does not count the whole table.
+    """
     inlines = [PostInline]
+    list_display = ('subject', 'board', 'starter', 'posts_count', 'views', 'last_updated')
+    list_select_related = ('board', 'starter')
+    list_filter = ('board', )
+    raw_id_fields = ('starter', )
+    search_fields = ('=id', '=starter__username')
+    username_lookup = 'starter__username'
+    show_full_result_count = False
+
+    def get_inline_instances(self, request, obj=None):
+        # The posts inline is read only, there is nothing to validate or save
+        if request.method == 'POST':
+            return []
+        return super().get_inline_instances(request, obj)
+
+    def save_model(self, request, obj, form, change):
+        if change and 'board' in form.changed_data:
+            obj._previous_board = form.initial.get('board')
+        super().save_model(request, obj, form, change)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        previous_board = getattr(form.instance, '_previous_board', None)
+        if previous_board is not None:
+            # Posts follow their topic to the new board, so both boards have to be recounted
+            Board.objects.get(pk=previous_board).update_stats()
+            form.instance.board.update_stats()
+
+
+class PostAdmin(ExactSearchMixin, admin.ModelAdmin):
+    """
+        The topic and the author of a post are fixed once it exists, the topic, board and author counters
+        and the search index only follow posts being created and deleted.
+    """
+    list_display = ('__str__', 'topic', 'created_by', 'created_at')
+    list_select_related = ('topic', 'created_by')
+    raw_id_fields = ('topic', 'created_by', 'updated_by')
+    search_fields = ('=id', '=created_by__username')
+    username_lookup = 'created_by__username'
+    show_full_result_count = False
+
+    def get_readonly_fields(self, request, obj=None):
+        if obj is not None:
+            return ('topic', 'created_by')
+        return ()
+
+
+class QueryFingerprintAdmin(admin.ModelAdmin):
+    """
+        Read only, the rows are written by `boards.fingerprints`. Deleting them starts the counts over.
+    """
+    list_display = (
+        'view_name', 'short_sql', 'executions', 'requests', 'executions_per_request', 'max_per_request',
+        'repeated_requests', 'total_time', 'last_seen'
+    )
+    list_filter = ('view_name', )
+    search_fields = ('view_name', 'sql')
+    ordering = ('-executions', )
+    readonly_fields = [field.name for field in QueryFingerprint._meta.fields]
+
+    def short_sql(self, obj):
+        return Truncator(obj.sql).chars(120)
+    short_sql.short_description = 'SQL'
+
+    def executions_per_request(self, obj):
+        return '{:.1f}'.format(obj.get_executions_per_request())
+
+    def has_add_permission(self, request):
+        return False
 
 
-admin.site.register(Board)
-admin.site.register(Topic, TopicAdmin)
\ No newline at end of file
+admin.site.register(Board, BoardAdmin)
+admin.site.register(Topic, TopicAdmin)
+admin.site.register(Post, PostAdmin)
+admin.site.register(QueryFingerprint, QueryFingerprintAdmin)
@@ -0,0 +1,110 @@
+"""
+    Validators for conditional GET (`ETag` / `Last-Modified`) of the board and topic pages,
+    used with `django.views.decorators.http.condition`.
+
+    The ETag covers everything the page shows except view counts and author post totals, so counting views
+    does not invalidate it. It also varies on the user and the query string (page or cursor).
+    The feeds are the same for everybody, their validators only depend on the board or topic.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+
+from .models import Board, Topic
+
+
+def hash_values(*values):
+    return hashlib.md5(repr(values).encode('utf-8')).hexdigest()
+
+
+def make_etag(request, *values):
+    return hash_values(*values, request.user.pk, request.META.get('QUERY_STRING', ''), settings.POST_CACHE_VERSION)
+
+
+def user_last_modified(request, last_modified):
+    # Logging in changes the page, a client relying on If-Modified-Since alone must not get a 304 for it
+    last_login = request.user.last_login if request.user.is_authenticated else None
+    if last_login is not None and (last_modified is None or last_login > last_modified):
+        return last_login
+    return last_modified
+
+
+def latest(*dates):
+    dates = [date for date in dates if date is not None]
+    return max(dates) if dates else None
+
+
+def get_board_state(request, pk):
+    if not hasattr(request, '_board_state'):
+        topics = Topic.objects.filter(board=OuterRef('pk'))
+        newest_topic = topics.order_by('-last_updated').values('last_updated')[:1]
+        # A subject edit moves none of the board's counters or dates, only the topic's `last_edited`
+        newest_edit = topics.order_by('-last_edited').values('last_edited')[:1]
+        request._board_state = Board.objects.filter(pk=pk) \
+            .annotate(newest_topic=Subquery(newest_topic), newest_edit=Subquery(newest_edit)) \
+            .values_list('newest_topic', 'newest_edit', 'topics_count', 'posts_count', 'last_post').first()
+    return request._board_state
+
+
+def board_etag(request, pk):
+    state = get_board_state(request, pk)
+    if state is None:
+        return None
+    return make_etag(request, 'board', pk, *state)
+
+
+def board_last_modified(request, pk):
+    state = get_board_state(request, pk)
+    if state is None:
+        return None
+    return user_last_modified(request, latest(state[0], state[1]))
+
+
+def board_feed_etag(request, pk):
+    state = get_board_state(request, pk)
+    if state is None:
+        return None
+    return hash_values('board feed', pk, *state)
+
+
+def board_feed_last_modified(request, pk):
+    state = get_board_state(request, pk)
+    return latest(state[0], state[1]) if state is not None else None
+
+
+def get_topic_state(request, board_pk, topic_pk):
+    if not hasattr(request, '_topic_state'):
+        request._topic_state = Topic.objects.filter(board__pk=board_pk, pk=topic_pk) \
+            .values_list('last_updated', 'last_edited', 'posts_count').first()
+    return request._topic_state
+
+
+def topic_etag(request, board_pk, topic_pk):
+    state = get_topic_state(request, board_pk, topic_pk)
+    if state is None:
+        return None
+    return make_etag(request, 'topic', topic_pk, *state)
+
+
+def topic_last_modified(request, board_pk, topic_pk):
+    state = get_topic_state(request, board_pk, topic_pk)
+    if state is None:
+        return None
+    last_updated, last_edited, posts_count = state
+    return user_last_modified(request, max(last_updated, last_edited))
+
+
+def topic_feed_etag(request, board_pk, topic_pk):
+    state = get_topic_state(request, board_pk, topic_pk)
+    if state is None:
+        return None
+    return hash_values('topic feed', topic_pk, *state, settings.POST_CACHE_VERSION)
+
+
+def topic_feed_last_modified(request, board_pk, topic_pk):
+    state = get_topic_state(request, board_pk, topic_pk)
+    if state is None:
+        return None
+    last_updated, last_edited, posts_count = state
+    return max(last_updated, last_edited)
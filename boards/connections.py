@@ -0,0 +1,107 @@
+"""
+    Persistent database connections and their statistics.
+
+    Django 1.11 has no connection pool: with `CONN_MAX_AGE` every thread keeps its own connection per database
+    open between requests, which is what a pool saves (connecting and authenticating on every request).
+    `check_connections` runs at the start of every request, after Django has dropped the connections that
+    outlived `CONN_MAX_AGE` or saw errors, and pings the ones about to be reused when `CONN_HEALTH_CHECKS`
+    is on, so a connection the server closed while idle is replaced before the view uses it. Only connections
+    idle for `CONN_HEALTH_CHECK_INTERVAL` seconds are pinged, a busy connection is known to work.
+
+    The counters are per process, `connection_stats` shows those of the process serving the request.
+"""
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.http import JsonResponse
+
+
+class ConnectionStats:
+    """
+        connects:         new connections opened
+        reconnects:       new connections opened by a thread that had one to the same database before
+        checkouts:        requests that started with an open connection to reuse
+        health_checks:    pings of idle connections about to be reused
+        health_failures:  pings that failed, the connection was closed and replaced on first use
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._local = threading.local()
+
+    def increment(self, name, alias):
+        with self._lock:
+            self._counts[name, alias] += 1
+
+    def connected(self, alias):
+        seen = self._local.__dict__.setdefault('aliases', set())
+        self.increment('reconnects' if alias in seen else 'connects', alias)
+        seen.add(alias)
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self._counts)
+        stats = {}
+        for (name, alias), count in counts.items():
+            stats.setdefault(alias, Counter())[name] = count
+        return {alias: dict(counts) for alias, counts in stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+connection_stats = ConnectionStats()
+
+
+def track_use(connection):
+    """
+        Stamps the connection with the time it last made a cursor in `last_used`. Like
+        `fingerprints.instrument`, the cursor factories are wrapped once per connection.
+    """
+    connection.last_used = time.monotonic()
+    if getattr(connection, '_use_tracked', False):
+        return
+
+    def wrap(make_cursor):
+        def wrapper(cursor):
+            connection.last_used = time.monotonic()
+            return make_cursor(cursor)
+        return wrapper
+
+    connection.make_cursor = wrap(connection.make_cursor)
+    connection.make_debug_cursor = wrap(connection.make_debug_cursor)
+    connection._use_tracked = True
+
+
+def check_connections():
+    now = time.monotonic()
+    for connection in connections.all():
+        # Never replace a connection in the middle of a transaction
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        connection_stats.increment('checkouts', connection.alias)
+        idle = now - getattr(connection, 'last_used', 0)
+        if settings.CONN_HEALTH_CHECKS and idle >= settings.CONN_HEALTH_CHECK_INTERVAL:
+            connection_stats.increment('health_checks', connection.alias)
+            if connection.is_usable():
+                connection.last_used = now
+            else:
+                connection_stats.increment('health_failures', connection.alias)
+                connection.close()
+
+
+@staff_member_required
+def connection_stats_view(request):
+    return JsonResponse({
+        'pid': os.getpid(),
+        'conn_max_age': {alias: connections[alias].settings_dict['CONN_MAX_AGE'] for alias in connections},
+        'health_checks': settings.CONN_HEALTH_CHECKS,
+        'databases': connection_stats.snapshot(),
+    })
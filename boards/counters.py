@@ -0,0 +1,175 @@
+import atexit
+import base64
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """
+        Collects topic view hits in memory and writes them in batches of `F('views') + n` updates,
+        so a hot topic costs one UPDATE per flush instead of a full row save per view.
+
+        The buffer is flushed by the hit that finds `VIEW_COUNTER_FLUSH_INTERVAL` seconds elapsed since the
+        last flush or `VIEW_COUNTER_MAX_PENDING` hits waiting, by a timer `VIEW_COUNTER_FLUSH_INTERVAL` seconds
+        after the first buffered hit, so an idle process does not keep them, and when the process exits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._pending_hits = 0
+        self._last_flush = time.monotonic()
+        self._timer = None
+
+    def hit(self, topic_pk):
+        with self._lock:
+            self._pending[topic_pk] += 1
+            self._pending_hits += 1
+            due = (
+                self._pending_hits >= settings.VIEW_COUNTER_MAX_PENDING or
+                time.monotonic() - self._last_flush >= settings.VIEW_COUNTER_FLUSH_INTERVAL
+            )
+            if not due:
+                self._schedule()
+        if due:
+            self.flush()
+
+    def _schedule(self):
+        # Called with the lock held
+        if self._timer is None:
+            self._timer = threading.Timer(settings.VIEW_COUNTER_FLUSH_INTERVAL, self.flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel(self):
+        # Called with the lock held
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # The database connections opened by the timer's thread
+            connections.close_all()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._pending_hits = 0
+            self._last_flush = time.monotonic()
+            self._cancel()
+        if not pending:
+            return
+
+        try:
+            self.write(pending)
+        except DatabaseError:
+            logger.exception('Could not write %d topic views, keeping them for the next flush', sum(pending.values()))
+            with self._lock:
+                self._pending.update(pending)
+                self._pending_hits += sum(pending.values())
+                self._schedule()
+
+    def reset(self):
+        with self._lock:
+            self._pending = Counter()
+            self._pending_hits = 0
+            self._cancel()
+
+    def write(self, pending):
+        from .models import Topic
+
+        # Topics viewed the same number of times share one UPDATE
+        by_views = defaultdict(list)
+        for topic_pk, views in pending.items():
+            by_views[views].append(topic_pk)
+        with transaction.atomic():
+            for views, topic_pks in by_views.items():
+                Topic.objects.filter(pk__in=topic_pks).update(views=F('views') + views)
+
+
+class ViewedTopics:
+    """
+        Remembers the topics a session has been counted for in two fixed size Bloom filters instead of one
+        session key per topic, so the session stays the same size however many topics are read.
+
+        A topic is counted again once it has been missing from both generations, i.e. after
+        `VIEWED_TOPICS_MAX_AGE` to twice that seconds, or sooner for readers who fill a generation
+        with more than `VIEWED_TOPICS_BITS / 16` topics (false positives stay around 0.5%).
+        A false positive only means one view is not counted.
+    """
+    session_key = 'viewed_topics'
+    legacy_prefix = 'viewed_topic_'
+    hashes = 3
+
+    def __init__(self, session):
+        self.session = session
+        self.bits = settings.VIEWED_TOPICS_BITS
+        self.capacity = self.bits // 16
+
+    def add(self, topic_pk):
+        """
+            Mark the topic as viewed, True if it had not been viewed yet.
+        """
+        state = self.load()
+        current = bytearray(base64.b64decode(state['current']))
+        previous = base64.b64decode(state['previous'])
+        positions = self.positions(topic_pk)
+        if all(self.contains(current, position) for position in positions):
+            return False
+
+        # Topics seen in the previous generation are carried over without being counted again
+        seen = all(self.contains(previous, position) for position in positions)
+        for position in positions:
+            current[position // 8] |= 1 << position % 8
+        state['current'] = base64.b64encode(bytes(current)).decode()
+        state['count'] += 1
+        self.session[self.session_key] = state
+        return not seen
+
+    def load(self):
+        state = self.session.get(self.session_key)
+        now = int(time.time())
+        if state is None or state.get('bits') != self.bits:
+            self.purge_legacy_keys()
+            return self.empty_state(now, previous=self.empty_filter())
+        age = now - state['started']
+        if age >= 2 * settings.VIEWED_TOPICS_MAX_AGE:
+            return self.empty_state(now, previous=self.empty_filter())
+        if age >= settings.VIEWED_TOPICS_MAX_AGE or state['count'] >= self.capacity:
+            return self.empty_state(now, previous=state['current'])
+        return state
+
+    def empty_state(self, now, previous):
+        return {'bits': self.bits, 'started': now, 'count': 0, 'current': self.empty_filter(), 'previous': previous}
+
+    def empty_filter(self):
+        return base64.b64encode(bytes(self.bits // 8)).decode()
+
+    def positions(self, topic_pk):
+        digest = hashlib.md5(str(topic_pk).encode()).digest()
+        return [int.from_bytes(digest[i * 4:i * 4 + 4], 'little') % self.bits for i in range(self.hashes)]
+
+    @staticmethod
+    def contains(bloom, position):
+        return bloom[position // 8] & 1 << position % 8
+
+    def purge_legacy_keys(self):
+        # Sessions from before this structure kept a `viewed_topic_<pk>` key per topic
+        for key in [key for key in self.session.keys() if key.startswith(self.legacy_prefix)]:
+            del self.session[key]
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush)
@@ -0,0 +1,77 @@
+"""
+    The topics and boards this thread is deleting.
+
+    A topic's posts are deleted before the topic, and a board's topics before the board. While that happens the
+    post receivers skip the incremental counts of topics being deleted, and each board left behind is recounted
+    once, when the last of its topics in the delete is gone, instead of once per topic. A board being deleted
+    is not recounted at all.
+
+    Deletes of `Topic` and `Board` run in `tracked_delete`, which clears the state however the delete ends:
+    topics left marked by a failed delete would make later deletes of their posts skip the counts.
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+_state = threading.local()
+
+
+def get_state():
+    if not hasattr(_state, 'topics'):
+        reset()
+    return _state
+
+
+def reset():
+    # Board pk of every topic being deleted, the number of them per board and the boards being deleted
+    _state.topics = {}
+    _state.pending = Counter()
+    _state.boards = set()
+    _state.depth = 0
+
+
+@contextmanager
+def tracked_delete():
+    state = get_state()
+    state.depth += 1
+    try:
+        yield
+    finally:
+        state.depth -= 1
+        if not state.depth:
+            reset()
+
+
+def is_deleting_topic(pk):
+    return pk in get_state().topics
+
+
+def topic_deleting(topic):
+    state = get_state()
+    if topic.pk not in state.topics:
+        state.topics[topic.pk] = topic.board_id
+        state.pending[topic.board_id] += 1
+
+
+def board_deleting(pk):
+    get_state().boards.add(pk)
+
+
+def topic_deleted(pk):
+    """
+        The board to recount now that the topic is gone, `None` while more of its topics are being deleted or
+        when the board itself is.
+    """
+    state = get_state()
+    board_id = state.topics.pop(pk, None)
+    if board_id is None:
+        return None
+    state.pending[board_id] -= 1
+    if state.pending[board_id]:
+        return None
+    del state.pending[board_id]
+    return None if board_id in state.boards else board_id
+
+
+def board_deleted(pk):
+    get_state().boards.discard(pk)
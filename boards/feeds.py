@@ -0,0 +1,118 @@
+import math
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from .conditional import (
+    board_feed_etag, board_feed_last_modified, hash_values, topic_feed_etag, topic_feed_last_modified
+)
+from .models import Board, Topic
+
+
+class BoardFeed(Feed):
+    feed_type = Atom1Feed
+
+    def get_object(self, request, pk):
+        return get_object_or_404(Board, pk=pk)
+
+    def title(self, board):
+        return '{} - Django Boards'.format(board.name)
+
+    def subtitle(self, board):
+        return board.description
+
+    def link(self, board):
+        return reverse('boards:board_topics', kwargs={'pk': board.pk})
+
+    def items(self, board):
+        return board.topics.select_related('starter').order_by('-last_updated', '-pk')[:20]
+
+    def item_title(self, topic):
+        return topic.subject
+
+    def item_description(self, topic):
+        replies = topic.posts_count - 1
+        return '{} repl{}'.format(replies, 'y' if replies == 1 else 'ies')
+
+    def item_link(self, topic):
+        return reverse('boards:topic_posts', kwargs={'board_pk': topic.board_id, 'topic_pk': topic.pk})
+
+    def item_author_name(self, topic):
+        return topic.starter.username
+
+    def item_updateddate(self, topic):
+        return topic.last_updated
+
+
+class TopicFeed(Feed):
+    feed_type = Atom1Feed
+
+    def get_object(self, request, board_pk, topic_pk):
+        return get_object_or_404(Topic.objects.select_related('board'), board__pk=board_pk, pk=topic_pk)
+
+    def title(self, topic):
+        return topic.subject
+
+    def subtitle(self, topic):
+        return topic.board.name
+
+    def link(self, topic):
+        return reverse('boards:topic_posts', kwargs={'board_pk': topic.board_id, 'topic_pk': topic.pk})
+
+    def items(self, topic):
+        posts = list(topic.get_last_ten_posts())
+        # The newest post is the last one of the topic, each entry links to the page it is on
+        for position, post in enumerate(posts):
+            post.number = topic.posts_count - position
+            post.page = max(math.ceil(post.number / 20), 1)
+        return posts
+
+    def item_title(self, post):
+        return post.topic.subject if post.number == 1 else 'Re: {}'.format(post.topic.subject)
+
+    def item_description(self, post):
+        return post.get_message_as_markdown()
+
+    def item_link(self, post):
+        url = reverse('boards:topic_posts', kwargs={'board_pk': post.topic.board_id, 'topic_pk': post.topic_id})
+        return '{}?page={}#{}'.format(url, post.page, post.pk)
+
+    def item_author_name(self, post):
+        return post.created_by.username
+
+    def item_pubdate(self, post):
+        return post.created_at
+
+    def item_updateddate(self, post):
+        return post.updated_at or post.created_at
+
+
+def cached_feed(feed, etag_func, last_modified_func):
+    """
+        Serve `feed` with conditional GET and keep its XML in the cache under its ETag. The ETag changes with
+        every write to the board or topic, so an unchanged feed costs the ETag's queries and stale copies are
+        never served, they just expire. The links in the XML are absolute, made from the request's scheme and
+        host, which are part of the cache key.
+    """
+    @condition(etag_func=etag_func, last_modified_func=last_modified_func)
+    def view(request, **kwargs):
+        etag = etag_func(request, **kwargs)
+        if etag is None:
+            # Missing board or topic, the feed raises the 404
+            return feed(request, **kwargs)
+        key = 'feed:{}'.format(hash_values(etag, request.scheme, request.get_host()))
+        response = cache.get(key)
+        if response is None:
+            response = feed(request, **kwargs)
+            cache.set(key, response, settings.FEED_CACHE_TIMEOUT)
+        return response
+    return view
+
+
+board_feed = cached_feed(BoardFeed(), board_feed_etag, board_feed_last_modified)
+topic_feed = cached_feed(TopicFeed(), topic_feed_etag, topic_feed_last_modified)
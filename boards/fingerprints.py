@@ -0,0 +1,230 @@
+"""
+    SQL fingerprints per URL name.
+
+    With `SQL_FINGERPRINTS` on, `QueryFingerprintMiddleware` records every statement a request executes, on any
+    database, as a fingerprint: the SQL with its parameters, literals and `IN (...)` lists folded, so
+    `board.topics.count` is one fingerprint whichever board it counts. A fingerprint executed more than
+    `SQL_FINGERPRINT_REPEAT_THRESHOLD` times in one request is logged as an N+1 query.
+
+    The counts are added up in memory and written to `QueryFingerprint` every
+    `SQL_FINGERPRINT_FLUSH_INTERVAL` seconds, see them in the admin or with `dump_query_fingerprints`.
+"""
+import atexit
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER = re.compile(r'%s|\?')
+LIST = re.compile(r'\((?:\?, ?)*\?\)')
+LISTS = re.compile(r'\(\.\.\.\)(?:, ?\(\.\.\.\))+')
+SPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """
+        The fingerprint and the normalized SQL of a statement.
+        The ORM passes parameters apart, only `LIMIT`/`OFFSET` and the length of `IN` lists vary in the SQL itself.
+    """
+    normalized = STRING.sub('?', sql)
+    normalized = NUMBER.sub('?', normalized)
+    normalized = PLACEHOLDER.sub('?', normalized)
+    normalized = LISTS.sub('(...)', LIST.sub('(...)', normalized))
+    normalized = SPACE.sub(' ', normalized).strip()
+    return hashlib.md5(normalized.encode()).hexdigest()[:16], normalized
+
+
+class RequestQueries:
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.durations = defaultdict(float)
+        self.statements = {}
+
+    def record(self, sql, duration):
+        key, normalized = fingerprint(sql)
+        self.counts[key] += 1
+        self.durations[key] += duration
+        self.statements[key] = normalized
+
+    def repeated(self, threshold):
+        return {key: count for key, count in self.counts.items() if count > threshold}
+
+
+class FingerprintCursor:
+    def __init__(self, cursor, queries):
+        self.cursor = cursor
+        self.queries = queries
+
+    def __getattr__(self, attr):
+        return getattr(self.cursor, attr)
+
+    def __iter__(self):
+        return iter(self.cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        return self.cursor.__exit__(type, value, traceback)
+
+    def execute(self, sql, params=None):
+        started = time.perf_counter()
+        try:
+            return self.cursor.execute(sql, params)
+        finally:
+            self.queries.record(sql, time.perf_counter() - started)
+
+    def executemany(self, sql, param_list):
+        started = time.perf_counter()
+        try:
+            return self.cursor.executemany(sql, param_list)
+        finally:
+            self.queries.record(sql, time.perf_counter() - started)
+
+
+def instrument(connection):
+    """
+        Django 1.11 has no hook around query execution, the cursor factories of the connection are wrapped
+        instead, once per connection. Cursors are only wrapped while a request is recorded in this thread.
+    """
+    if getattr(connection, '_fingerprinted', False):
+        return
+
+    def wrap(make_cursor):
+        def wrapper(cursor):
+            cursor = make_cursor(cursor)
+            queries = getattr(_state, 'queries', None)
+            return cursor if queries is None else FingerprintCursor(cursor, queries)
+        return wrapper
+
+    connection.make_cursor = wrap(connection.make_cursor)
+    connection.make_debug_cursor = wrap(connection.make_debug_cursor)
+    connection._fingerprinted = True
+
+
+class FingerprintStats:
+    """
+        Adds up the fingerprints of the recorded requests per URL name and fingerprint, and writes them as
+        `F()` increments at most every `SQL_FINGERPRINT_FLUSH_INTERVAL` seconds and when the process exits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_flush = time.monotonic()
+
+    def add(self, view_name, queries, threshold):
+        with self._lock:
+            for key, count in queries.counts.items():
+                stats = self._pending.setdefault((view_name, key), {
+                    'sql': queries.statements[key],
+                    'executions': 0,
+                    'requests': 0,
+                    'repeated_requests': 0,
+                    'max_per_request': 0,
+                    'total_time': 0.0,
+                })
+                stats['executions'] += count
+                stats['requests'] += 1
+                stats['repeated_requests'] += count > threshold
+                stats['max_per_request'] = max(stats['max_per_request'], count)
+                stats['total_time'] += queries.durations[key]
+            due = time.monotonic() - self._last_flush >= settings.SQL_FINGERPRINT_FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        try:
+            self.write(pending)
+        except DatabaseError:
+            logger.exception('Could not write %d query fingerprints, keeping them for the next flush', len(pending))
+            with self._lock:
+                for key, stats in pending.items():
+                    self.merge(key, stats)
+
+    def merge(self, key, stats):
+        current = self._pending.get(key)
+        if current is None:
+            self._pending[key] = stats
+            return
+        for name in ('executions', 'requests', 'repeated_requests', 'total_time'):
+            current[name] += stats[name]
+        current['max_per_request'] = max(current['max_per_request'], stats['max_per_request'])
+
+    def write(self, pending):
+        from .models import QueryFingerprint
+
+        now = timezone.now()
+        with transaction.atomic():
+            for (view_name, key), stats in pending.items():
+                updated = QueryFingerprint.objects.filter(view_name=view_name, fingerprint=key).update(
+                    executions=F('executions') + stats['executions'],
+                    requests=F('requests') + stats['requests'],
+                    repeated_requests=F('repeated_requests') + stats['repeated_requests'],
+                    max_per_request=Greatest(F('max_per_request'), stats['max_per_request']),
+                    total_time=F('total_time') + stats['total_time'],
+                    last_seen=now,
+                )
+                if not updated:
+                    QueryFingerprint.objects.create(
+                        view_name=view_name, fingerprint=key, first_seen=now, last_seen=now, **stats
+                    )
+
+    def reset(self):
+        with self._lock:
+            self._pending = {}
+
+
+fingerprint_stats = FingerprintStats()
+atexit.register(fingerprint_stats.flush)
+
+
+class QueryFingerprintMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SQL_FINGERPRINTS:
+            return self.get_response(request)
+
+        for connection in connections.all():
+            instrument(connection)
+        queries = _state.queries = RequestQueries()
+        try:
+            response = self.get_response(request)
+        finally:
+            # The queries writing the fingerprints are not recorded
+            _state.queries = None
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match is not None else 'unresolved'
+        threshold = settings.SQL_FINGERPRINT_REPEAT_THRESHOLD
+        for key, count in queries.repeated(threshold).items():
+            logger.warning(
+                'N+1 query in %s, executed %d times: %s', view_name, count, queries.statements[key],
+                extra={'request': request}
+            )
+        fingerprint_stats.add(view_name, queries, threshold)
+        return response
@@ -0,0 +1,42 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from accounts.models import Profile, hash_email
+from boards.templatetags.gravatar import gravatar, gravatar_url
+
+
+def uncached_gravatar(user):
+    # The filter as it was before the email hash was stored and the URLs cached
+    email = user.email.lower().encode('utf-8')
+    return 'https://www.gravatar.com/avatar/{md5}?{params}'.format(
+        md5=hashlib.md5(email).hexdigest(),
+        params=urlencode({'d': 'mm', 's': '256'})
+    )
+
+
+class Command(BaseCommand):
+    help = 'Measure the per-post cost of the gravatar filter for pages written by a few authors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--authors', type=int, default=5)
+
+    def handle(self, *args, **options):
+        authors = []
+        for i in range(options['authors']):
+            user = User(username='user{}'.format(i), email='User{}@Example.com'.format(i))
+            user.profile = Profile(email_hash=hash_email(user.email))
+            authors.append(user)
+        posts = [authors[i % len(authors)] for i in range(options['posts'])]
+
+        gravatar_url.cache_clear()
+        for name, func in (('uncached', uncached_gravatar), ('gravatar', gravatar)):
+            start = time.perf_counter()
+            for user in posts:
+                func(user)
+            elapsed = time.perf_counter() - start
+            self.stdout.write('{:<10} {:>8.2f} us/post'.format(name, elapsed * 10 ** 6 / len(posts)))
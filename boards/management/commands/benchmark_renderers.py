@@ -0,0 +1,45 @@
+import random
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand
+
+from boards import samples
+from boards.rendering import RENDERERS, get_renderer
+
+
+class Command(BaseCommand):
+    help = 'Measure the throughput and latency of every markdown renderer on realistic post messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=500)
+        parser.add_argument('--length', type=int, default=2500, help='Length of every message in characters')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        messages = [samples.message(rng, options['length']) for _ in range(options['posts'])]
+
+        self.stdout.write('{:<16} {:>10} {:>10} {:>10}'.format('renderer', 'posts/s', 'p50 ms', 'p99 ms'))
+        for name in sorted(RENDERERS):
+            try:
+                renderer = get_renderer(name)
+            except ImproperlyConfigured as e:
+                self.stdout.write('{:<16} skipped: {}'.format(name, e))
+                continue
+
+            # Warm up caches and lazily built state before measuring
+            renderer.render(messages[0])
+            timings = []
+            for text in messages:
+                start = time.perf_counter()
+                renderer.render(text)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+
+            self.stdout.write('{:<16} {:>10.0f} {:>10.2f} {:>10.2f}'.format(
+                name,
+                len(timings) / sum(timings),
+                timings[len(timings) // 2] * 1000,
+                timings[min(int(len(timings) * 0.99), len(timings) - 1)] * 1000,
+            ))
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.db.models import F
+
+from boards.models import Board
+from boards.pagination import KeysetPaginator
+
+
+class Command(BaseCommand):
+    help = 'Compare OFFSET and keyset pagination of a board topics list on the first, middle and last page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board', type=int, help='Primary key of the board to paginate')
+        parser.add_argument('--per-page', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            board = Board.objects.get(pk=options['board'])
+        except Board.DoesNotExist:
+            raise CommandError('Board {} does not exist'.format(options['board']))
+
+        per_page = options['per_page']
+        queryset = board.topics.order_by('-last_updated', '-pk').annotate(replies=F('posts_count') - 1)
+        paginator = Paginator(queryset, per_page)
+        keyset_paginator = KeysetPaginator(queryset, per_page, 'last_updated', count=board.topics_count)
+
+        self.stdout.write('{:>10} {:>14} {:>14}'.format('page', 'offset ms', 'keyset ms'))
+        for number in sorted({1, paginator.num_pages // 2 or 1, paginator.num_pages}):
+            cursor = None
+            if number > 1:
+                # The cursor a user would have followed to reach this page is the last row of the previous one
+                cursor = keyset_paginator.encode_cursor(queryset[(number - 1) * per_page - 1])
+            offset_ms = self.measure(lambda: list(Paginator(queryset, per_page).page(number)), options['repeat'])
+            keyset_ms = self.measure(lambda: list(keyset_paginator.page(after=cursor)), options['repeat'])
+            self.stdout.write('{:>10} {:>14.2f} {:>14.2f}'.format(number, offset_ms, keyset_ms))
+
+    def measure(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) * 1000 / repeat
@@ -0,0 +1,135 @@
+import json
+import math
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from boards import urls
+from boards.models import Board, Topic
+
+
+def percentile(timings, fraction):
+    # Nearest rank on sorted timings
+    return timings[min(max(math.ceil(fraction * len(timings)) - 1, 0), len(timings) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Request every page of boards/urls.py through the test client against the current database and '
+        'write the p50/p95/p99 latency and query count of each to a JSON report. '
+        'Only GET requests are made, nothing is written except view counts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--compare', help='A previous JSON report to print the differences against')
+        parser.add_argument('--search', default='django query', help='Query of the search page')
+
+    def handle(self, *args, **options):
+        previous = self.load_report(options['compare'])['views'] if options['compare'] else {}
+        requests = self.get_requests(options['search'])
+        client = Client()
+        client.force_login(self.user)
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=list(settings.ALLOWED_HOSTS) + ['testserver']):
+            for label, url in requests:
+                results[label] = self.measure(client, url, options['repeat'])
+
+        report = {
+            'created': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'repeat': options['repeat'],
+            'views': results,
+        }
+        self.print_report(results, previous)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS('Report written to {}'.format(options['output'])))
+
+    def get_requests(self, search):
+        """
+            The busiest board and topic are the worst case of every list, each list is requested on its
+            first and on its last page.
+        """
+        board = Board.objects.order_by('-topics_count').first()
+        topic = Topic.objects.order_by('-posts_count').first()
+        if board is None or topic is None:
+            raise CommandError('The database has no topics, seed it with `seed_forum` first')
+        post = topic.posts.select_related('created_by').order_by('pk').first()
+        # Signed in as the author of the first post, who may edit it, or as the starter of a topic without posts
+        self.user = topic.starter if post is None else post.created_by
+
+        kwargs = {'pk': board.pk, 'board_pk': topic.board_id, 'topic_pk': topic.pk, 'post_pk': post and post.pk}
+        queries = {
+            'board_topics': ['', 'page={}'.format(max(math.ceil(board.topics_count / 10), 1))],
+            'topic_posts': ['', 'page={}'.format(topic.get_page_count() or 1)],
+            'search': [urlencode({'q': search}), urlencode({'q': search, 'page': 2})],
+        }
+
+        requests = []
+        for pattern in urls.urlpatterns:
+            if any(kwargs[name] is None for name in pattern.regex.groupindex):
+                continue
+            url = reverse('boards:' + pattern.name, kwargs={
+                name: kwargs[name] for name in pattern.regex.groupindex
+            })
+            for query in queries.get(pattern.name, ['']):
+                label = pattern.name + ('?' + query if query else '')
+                requests.append((label, url + ('?' + query if query else '')))
+        return requests
+
+    def measure(self, client, url, repeat):
+        # The first request warms up the caches and sessions, like on a server that has been running for a while
+        client.get(url)
+        timings = []
+        queries = 0
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = client.get(url)
+                timings.append(time.perf_counter() - started)
+            queries = max(queries, len(context))
+        timings.sort()
+        return {
+            'url': url,
+            'status': response.status_code,
+            'p50_ms': round(percentile(timings, 0.5) * 1000, 2),
+            'p95_ms': round(percentile(timings, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(timings, 0.99) * 1000, 2),
+            'queries': queries,
+        }
+
+    def load_report(self, path):
+        try:
+            with open(path) as report:
+                return json.load(report)
+        except (OSError, ValueError) as e:
+            raise CommandError('Cannot read the report {}: {}'.format(path, e))
+
+    def print_report(self, results, previous):
+        self.stdout.write('{:<34} {:>6} {:>9} {:>9} {:>9} {:>8}'.format(
+            'view', 'status', 'p50 ms', 'p95 ms', 'p99 ms', 'queries'
+        ))
+        for label, result in results.items():
+            self.stdout.write('{:<34} {:>6} {:>9.2f} {:>9.2f} {:>9.2f} {:>8}'.format(
+                label, result['status'], result['p50_ms'], result['p95_ms'], result['p99_ms'], result['queries']
+            ))
+            if label in previous:
+                before = previous[label]
+                self.stdout.write('{:<34} {:>6} {:>+9.2f} {:>+9.2f} {:>+9.2f} {:>+8}'.format(
+                    '  vs previous', '',
+                    result['p50_ms'] - before['p50_ms'],
+                    result['p95_ms'] - before['p95_ms'],
+                    result['p99_ms'] - before['p99_ms'],
+                    result['queries'] - before['queries'],
+                ))
@@ -0,0 +1,52 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from boards.models import QueryFingerprint
+from boards.transfer import DumpEncoder
+
+ORDERINGS = {
+    'executions': '-executions',
+    'time': '-total_time',
+    'repeated': '-repeated_requests',
+}
+
+
+class Command(BaseCommand):
+    help = 'Print the SQL fingerprints recorded per URL name as JSON, the most executed first'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', action='append', help='Only this URL name, e.g. boards:home')
+        parser.add_argument('--repeated', action='store_true', help='Only the fingerprints flagged as N+1 queries')
+        parser.add_argument('--order', choices=sorted(ORDERINGS), default='executions')
+        parser.add_argument('--limit', type=int, help='Print at most this many fingerprints')
+        parser.add_argument('--reset', action='store_true', help='Delete the printed fingerprints to start over')
+
+    def handle(self, *args, **options):
+        fingerprints = QueryFingerprint.objects.order_by(ORDERINGS[options['order']], 'pk')
+        if options['view']:
+            fingerprints = fingerprints.filter(view_name__in=options['view'])
+        if options['repeated']:
+            fingerprints = fingerprints.filter(repeated_requests__gt=0)
+        if options['limit']:
+            fingerprints = fingerprints[:options['limit']]
+
+        rows = []
+        for fingerprint in fingerprints:
+            rows.append({
+                'view_name': fingerprint.view_name,
+                'fingerprint': fingerprint.fingerprint,
+                'sql': fingerprint.sql,
+                'executions': fingerprint.executions,
+                'requests': fingerprint.requests,
+                'executions_per_request': round(fingerprint.get_executions_per_request(), 2),
+                'max_per_request': fingerprint.max_per_request,
+                'repeated_requests': fingerprint.repeated_requests,
+                'total_time': fingerprint.total_time,
+                'first_seen': fingerprint.first_seen,
+                'last_seen': fingerprint.last_seen,
+            })
+        self.stdout.write(json.dumps(rows, cls=DumpEncoder, indent=2))
+
+        if options['reset']:
+            QueryFingerprint.objects.filter(pk__in=[fingerprint.pk for fingerprint in fingerprints]).delete()
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import F
+
+from boards.models import Board, Post, Topic
+from boards.pagination import KeysetPaginator
+
+EXPLAIN = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+    'mysql': 'EXPLAIN ',
+}
+
+
+class Command(BaseCommand):
+    help = 'Print the database query plan of the queries behind the board, topic and home pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Board to use, the one with most topics by default')
+        parser.add_argument('--analyze', action='store_true', help='Run EXPLAIN ANALYZE (PostgreSQL only)')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in EXPLAIN:
+            raise CommandError('EXPLAIN is not supported for the {} backend'.format(connection.vendor))
+        explain = EXPLAIN[connection.vendor]
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('--analyze is only supported on PostgreSQL')
+            explain = 'EXPLAIN ANALYZE '
+
+        boards = Board.objects.all()
+        if options['board']:
+            boards = boards.filter(pk=options['board'])
+        board = boards.order_by('-topics_count').first()
+        if board is None:
+            raise CommandError('No board to explain the queries of')
+        topic = board.topics.order_by('-posts_count').first() or Topic(pk=0, board=board)
+
+        topics = board.topics.select_related('starter').order_by('-last_updated', '-pk') \
+            .annotate(replies=F('posts_count') - 1)
+        paginator = KeysetPaginator(topics, 10, 'last_updated')
+        # A cursor near the end of the board stands for a deep page
+        deep_topic = topics[max(board.topics_count - 11, 0):].first()
+        after = paginator.encode_cursor(deep_topic) if deep_topic else None
+
+        queries = [
+            ('Home page boards', Board.objects.select_related('last_post__created_by')),
+            ('Board topics, first page', paginator.get_queryset()[:11]),
+            ('Board topics, keyset page', paginator.get_queryset(after)[:11]),
+            ('Board topics, OFFSET page', topics[max(board.topics_count - 10, 0):board.topics_count]),
+            ('Topic posts page', topic.posts.select_related('created_by__profile').order_by('created_at')[:20]),
+            ('Board last post', Post.objects.filter(topic__board=board).order_by('-created_at')[:1]),
+        ]
+
+        with connection.cursor() as cursor:
+            for title, queryset in queries:
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute(explain + sql, params)
+                self.stdout.write(self.style.MIGRATE_HEADING(title))
+                self.stdout.write(sql % tuple(repr(param) for param in params))
+                for row in cursor.fetchall():
+                    self.stdout.write('  ' + ' '.join(str(column) for column in row))
+                self.stdout.write('')
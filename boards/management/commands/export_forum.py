@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from boards.transfer import MODELS, DumpEncoder, format_rate, open_dump
+
+
+class Command(BaseCommand):
+    help = 'Stream boards, topics and posts to a JSONL file (gzipped when the name ends with .gz)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+
+    def handle(self, *args, **options):
+        encoder = DumpEncoder(ensure_ascii=False)
+        started = time.perf_counter()
+        total = 0
+        with open_dump(options['path'], 'w') as dump:
+            for name, (model, fields) in MODELS.items():
+                model_started = time.perf_counter()
+                # `iterator()` uses a server-side cursor where the database supports it,
+                # so memory stays flat however many rows there are
+                rows = model.objects.order_by('pk').values(*fields).iterator()
+                count = 0
+                for row in rows:
+                    dump.write(encoder.encode({'model': name, 'fields': row}))
+                    dump.write('\n')
+                    count += 1
+                self.report(name, count, model_started)
+                total += count
+        self.stdout.write(self.style.SUCCESS(format_rate('Exported', total, started)))
+
+    def report(self, name, count, started):
+        self.stdout.write(format_rate('{}s:'.format(name.capitalize()), count, started))
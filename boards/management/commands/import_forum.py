@@ -0,0 +1,74 @@
+import json
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from boards.transfer import MODELS, format_rate, keep_timestamps, open_dump, reset_sequences
+
+DATETIME_FIELDS = {'last_updated', 'created_at', 'updated_at'}
+
+
+class Command(BaseCommand):
+    help = 'Load boards, topics and posts from an export_forum JSONL file with batched inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows inserted per transaction')
+        parser.add_argument('--no-reconcile', action='store_true',
+                            help='Skip rebuilding the statistics and the search index after the import')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.counts = dict.fromkeys(MODELS, 0)
+        self.started = time.perf_counter()
+        batch = []
+        batch_model = None
+
+        # `bulk_create` sends no signals, the counters and the search index are rebuilt once at the end
+        with keep_timestamps(), open_dump(options['path'], 'r') as dump:
+            for number, line in enumerate(dump, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    name = record['model']
+                    model, fields = MODELS[name]
+                    values = record['fields']
+                except (ValueError, KeyError) as e:
+                    raise CommandError('Line {}: invalid record ({})'.format(number, e))
+
+                if name != batch_model or len(batch) >= self.batch_size:
+                    self.flush(batch_model, batch)
+                    batch = []
+                    batch_model = name
+                for field in DATETIME_FIELDS.intersection(values):
+                    if values[field] is not None:
+                        values[field] = parse_datetime(values[field])
+                batch.append(model(**{field: values.get(field) for field in fields}))
+            self.flush(batch_model, batch)
+
+        reset_sequences([model for model, _ in MODELS.values()])
+        total = sum(self.counts.values())
+        self.stdout.write(self.style.SUCCESS(format_rate('Imported', total, self.started)))
+
+        if not options['no_reconcile']:
+            call_command('reconcile_stats', stdout=self.stdout)
+            call_command('rebuild_search_index', stdout=self.stdout)
+        self.stdout.write('Post HTML is rendered on first view, run `render_posts --missing` to render it ahead')
+
+    def flush(self, name, batch):
+        if not batch:
+            return
+        model, _ = MODELS[name]
+        with transaction.atomic():
+            # The statement size is left to Django, which keeps it under the backend's limits
+            # (SQLite's compound SELECT limit on Django 1.11)
+            model.objects.bulk_create(batch)
+        previous = self.counts[name]
+        self.counts[name] += len(batch)
+        # Progress roughly every 100 000 rows of a model
+        if self.counts[name] // 100000 != previous // 100000:
+            self.stdout.write(format_rate('{}s:'.format(name.capitalize()), self.counts[name], self.started))
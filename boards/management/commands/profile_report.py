@@ -0,0 +1,86 @@
+import glob
+import io
+import os
+import pstats
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from boards.profiling import issue_header_value
+
+# Own time of every function is charged to the first category whose fragment is in its file name
+CATEGORIES = OrderedDict([
+    ('markdown', ('/markdown/', '/mistune', '/pygments/', 'boards/rendering.py')),
+    ('templates', ('/django/template/', '/django/templatetags/', '/widget_tweaks/')),
+    ('database', ('/sqlite3/', '/psycopg2/', "<method 'execute' of ", "<method 'fetch")),
+    ('orm', ('/django/db/',)),
+])
+
+
+def get_category(filename):
+    for category, fragments in CATEGORIES.items():
+        if any(fragment in filename for fragment in fragments):
+            return category
+    return 'other'
+
+
+def get_categories(stats):
+    totals = Counter()
+    for (filename, _, function), (_, _, own_time, _, _) in stats.stats.items():
+        # Built-in functions have no file name, cProfile reports them as `~`
+        totals[get_category(function if filename == '~' else filename)] += own_time
+    return totals
+
+
+class Command(BaseCommand):
+    help = (
+        'Merge the request profiles written by ProfilingMiddleware per URL name and print the functions with the '
+        'highest cumulative time, and how the time splits between markdown, templates and the ORM'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', help='Defaults to PROFILING_DIRECTORY')
+        parser.add_argument('--view', action='append', help='Only this URL name, e.g. boards:topic_posts')
+        parser.add_argument('--top', type=int, default=20, help='Functions listed per URL name')
+        parser.add_argument('--sort', default='cumulative', help='Any pstats sort key, e.g. tottime or ncalls')
+        parser.add_argument(
+            '--issue-header', action='store_true',
+            help='Only print a value for the X-Profile header, which profiles any request it is sent with'
+        )
+
+    def handle(self, *args, **options):
+        if options['issue_header']:
+            self.stdout.write(issue_header_value())
+            return
+
+        directory = options['directory'] or settings.PROFILING_DIRECTORY
+        if not os.path.isdir(directory):
+            raise CommandError('No profiles in {}'.format(directory))
+        views = sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+        if options['view']:
+            views = [name for name in views if name in {view.replace(':', '.') for view in options['view']}]
+
+        for name in views:
+            files = sorted(glob.glob(os.path.join(directory, name, '*.prof')))
+            if files:
+                self.report(name.replace('.', ':'), files, options)
+
+    def report(self, view_name, files, options):
+        stream = io.StringIO()
+        stats = pstats.Stats(*files, stream=stream)
+        total = sum(own_time for _, _, own_time, _, _ in stats.stats.values()) or 1
+
+        self.stdout.write(self.style.SUCCESS('{}: {} requests, {:.3f}s'.format(view_name, len(files), total)))
+        categories = get_categories(stats)
+        for category in list(CATEGORIES) + ['other']:
+            self.stdout.write('  {:<10} {:>8.3f}s {:>6.1%}'.format(
+                category, categories[category], categories[category] / total
+            ))
+
+        try:
+            stats.sort_stats(options['sort'])
+        except KeyError:
+            raise CommandError('Unknown sort key {}'.format(options['sort']))
+        stats.print_stats(options['top'])
+        self.stdout.write(stream.getvalue())
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from boards.models import Post
+from boards.search import get_backend, get_index_rows
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of posts and topic subjects in primary key chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if not backend.indexed:
+            self.stdout.write('This database has no search index, search scans the posts table')
+            return
+
+        backend.clear()
+        bounds = Post.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write('No posts to index')
+            return
+
+        started = time.perf_counter()
+        indexed = 0
+        chunk_size = options['chunk_size']
+        for start in range(bounds['first'], bounds['last'] + 1, chunk_size):
+            posts = Post.objects.filter(pk__gte=start, pk__lt=start + chunk_size) \
+                .select_related('topic').only('pk', 'message', 'topic__subject')
+            rows = get_index_rows(posts)
+            # One transaction per chunk keeps the write lock short
+            with transaction.atomic():
+                backend.index(rows)
+            indexed += len(rows)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Indexed {} posts in {:.1f}s ({:.0f} posts/s)'.format(indexed, elapsed, indexed / max(elapsed, 1e-6))
+        ))
@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from accounts.models import Profile, hash_email
+from boards.models import Board, Post, Topic
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized board, topic and author statistics in one grouped pass over topics and posts'
+
+    def handle(self, *args, **options):
+        board_topics_counts = Topic.objects.filter(board=OuterRef('pk')).order_by().values('board') \
+            .annotate(count=Count('pk')).values('count')
+        board_posts_counts = Post.objects.filter(topic__board=OuterRef('pk')).order_by().values('topic__board') \
+            .annotate(count=Count('pk')).values('count')
+        topic_posts_counts = Post.objects.filter(topic=OuterRef('pk')).order_by().values('topic') \
+            .annotate(count=Count('pk')).values('count')
+        author_posts_counts = Post.objects.filter(created_by=OuterRef('user')).order_by().values('created_by') \
+            .annotate(count=Count('pk')).values('count')
+        last_posts = Post.objects.filter(topic__board=OuterRef('pk')).order_by('-created_at').values('pk')[:1]
+
+        with transaction.atomic():
+            Topic.objects.update(posts_count=Coalesce(Subquery(topic_posts_counts), 0))
+            boards = Board.objects.update(
+                topics_count=Coalesce(Subquery(board_topics_counts), 0),
+                posts_count=Coalesce(Subquery(board_posts_counts), 0),
+                last_post=Subquery(last_posts)
+            )
+            Profile.objects.bulk_create(
+                Profile(user=user, email_hash=hash_email(user.email))
+                for user in User.objects.filter(profile__isnull=True)
+            )
+            Profile.objects.update(posts_count=Coalesce(Subquery(author_posts_counts), 0))
+
+        self.stdout.write(self.style.SUCCESS('Reconciled statistics of {} boards'.format(boards)))
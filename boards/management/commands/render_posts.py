@@ -0,0 +1,68 @@
+import time
+from multiprocessing import Pool
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Max, Min
+
+from boards.models import Post
+
+
+def render_range(pk_range):
+    start, end, missing_only = pk_range
+    posts = Post.objects.filter(pk__gte=start, pk__lt=end).only('pk', 'message')
+    if missing_only:
+        posts = posts.filter(message_html='')
+    return [(post.pk, post.render_message()) for post in posts.iterator()]
+
+
+def store_chunk(chunk):
+    with transaction.atomic():
+        for pk, message_html in chunk:
+            Post.objects.filter(pk=pk).update(message_html=message_html)
+    return len(chunk)
+
+
+def init_worker():
+    # Needed when processes are spawned rather than forked, a no-op otherwise
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = 'Re-render the stored HTML of posts in primary key chunks, optionally using several processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--processes', type=int, default=1)
+        parser.add_argument('--missing', action='store_true', help='Only render posts without stored HTML')
+
+    def handle(self, *args, **options):
+        bounds = Post.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write('No posts to render')
+            return
+
+        chunk_size = options['chunk_size']
+        ranges = (
+            (start, start + chunk_size, options['missing'])
+            for start in range(bounds['first'], bounds['last'] + 1, chunk_size)
+        )
+
+        started = time.perf_counter()
+        rendered = 0
+        if options['processes'] > 1:
+            # Workers only read and render, the writes stay in this process so a single connection holds the
+            # write lock. Forked workers must not share the parent's database connections.
+            connections.close_all()
+            with Pool(options['processes'], initializer=init_worker) as pool:
+                for chunk in pool.imap_unordered(render_range, ranges):
+                    rendered += store_chunk(chunk)
+        else:
+            for pk_range in ranges:
+                rendered += store_chunk(render_range(pk_range))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            'Rendered {} posts in {:.1f}s ({:.0f} posts/s)'.format(rendered, elapsed, rendered / max(elapsed, 1e-6))
+        ))
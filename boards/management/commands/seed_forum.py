@@ -0,0 +1,123 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from boards import samples
+from boards.models import Board, Post, Topic
+from boards.rendering import render_markdown
+from boards.transfer import format_rate, keep_timestamps, reset_sequences
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic forum: boards with a Zipf distributed number of topics, '
+        'a long tail of posts per topic and realistic markdown messages'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--topics', type=int, default=2000, help='Topics of the busiest board')
+        parser.add_argument('--zipf', type=float, default=1.1, help='Exponent of the topics per board distribution')
+        parser.add_argument('--max-posts', type=int, default=500, help='Upper bound of the posts of one topic')
+        parser.add_argument('--pareto', type=float, default=1.2,
+                            help='Shape of the posts per topic distribution, lower means a longer tail')
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--days', type=int, default=365, help='Spread the posts over this many days')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows inserted per transaction')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.options = options
+        self.started = time.perf_counter()
+        self.topics = []
+        self.posts = []
+        self.counts = {'topic': 0, 'post': 0}
+
+        users = self.create_users(options['users'])
+        # The rows are inserted with explicit primary keys, SQLite does not return them from `bulk_create`
+        self.next_topic_pk = (Topic.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        self.next_post_pk = (Post.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        first_board = Board.objects.count()
+        now = timezone.now()
+
+        with keep_timestamps():
+            for rank in range(1, options['boards'] + 1):
+                board = Board.objects.create(
+                    name='Seed board {}'.format(first_board + rank),
+                    description=samples.sentence(self.rng, 6)[:100]
+                )
+                topics = max(1, round(options['topics'] / rank ** options['zipf']))
+                for _ in range(topics):
+                    self.add_topic(board, users, now)
+            self.flush()
+
+        reset_sequences([Topic, Post])
+        self.stdout.write(self.style.SUCCESS(format_rate(
+            'Seeded {} boards, {} topics and {} posts:'.format(
+                options['boards'], self.counts['topic'], self.counts['post']
+            ),
+            self.counts['topic'] + self.counts['post'],
+            self.started
+        )))
+        call_command('reconcile_stats', stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
+
+    def create_users(self, count):
+        existing = set(User.objects.filter(username__startswith='seed').values_list('username', flat=True))
+        usernames = ['seed{}'.format(i) for i in range(count)]
+        User.objects.bulk_create(
+            User(username=username, email='{}@example.com'.format(username), password='!')
+            for username in usernames if username not in existing
+        )
+        return list(User.objects.filter(username__in=usernames).values_list('pk', flat=True))
+
+    def add_topic(self, board, users, now):
+        posts = min(int(self.rng.paretovariate(self.options['pareto'])), self.options['max_posts'])
+        created_at = now - timedelta(seconds=self.rng.uniform(0, self.options['days'] * 86400))
+        topic = Topic(
+            pk=self.next_topic_pk,
+            subject=samples.sentence(self.rng, self.rng.randint(3, 10))[:255],
+            board=board,
+            starter_id=self.rng.choice(users),
+            views=posts * self.rng.randint(1, 50),
+        )
+        self.next_topic_pk += 1
+
+        for number in range(posts):
+            if number:
+                # Replies arrive about an hour apart
+                created_at = min(created_at + timedelta(seconds=self.rng.expovariate(1 / 3600)), now)
+            # Most posts are short, a few get close to the limit
+            length = min(int(self.rng.lognormvariate(5.5, 1)) + 20, 2500)
+            message = samples.message(self.rng, length)
+            self.posts.append(Post(
+                pk=self.next_post_pk,
+                message=message,
+                message_html=render_markdown(message),
+                topic_id=topic.pk,
+                created_at=created_at,
+                created_by_id=self.rng.choice(users),
+            ))
+            self.next_post_pk += 1
+        topic.last_updated = created_at
+        self.topics.append(topic)
+
+        if len(self.posts) >= self.options['batch_size']:
+            self.flush()
+
+    def flush(self):
+        with transaction.atomic():
+            Topic.objects.bulk_create(self.topics)
+            Post.objects.bulk_create(self.posts)
+        self.counts['topic'] += len(self.topics)
+        self.counts['post'] += len(self.posts)
+        self.topics = []
+        self.posts = []
@@ -0,0 +1,86 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter, the way a new worker starts
+PROBE = '''
+import json, os, sys, time
+started = time.perf_counter()
+from myproject.wsgi import application
+loaded = time.perf_counter()
+
+from django.conf import settings
+from django.test import Client
+from django.test.utils import override_settings
+from boards.models import Board, Topic
+
+report = {
+    'load_ms': (loaded - started) * 1000,
+    'modules': len(sys.modules),
+    'markdown_loaded': 'markdown' in sys.modules,
+    'requests': [],
+}
+topic = Topic.objects.order_by('-posts_count').first()
+paths = ['/', '/login/', '/signup/']
+if topic is not None:
+    paths += ['/boards/{}/'.format(topic.board_id), '/boards/{}/topics/{}/'.format(topic.board_id, topic.pk)]
+client = Client()
+with override_settings(ALLOWED_HOSTS=list(settings.ALLOWED_HOSTS) + ['testserver']):
+    for path in paths:
+        timings = []
+        for _ in range(2):
+            request_started = time.perf_counter()
+            status = client.get(path).status_code
+            timings.append((time.perf_counter() - request_started) * 1000)
+        report['requests'].append({'path': path, 'status': status, 'first_ms': timings[0], 'second_ms': timings[1]})
+print(json.dumps(report))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Start fresh interpreters with and without the worker warm-up and compare the time to load the WSGI '
+        'application with the cost of the first request to each main page'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Interpreters started per mode, the best is kept')
+
+    def handle(self, *args, **options):
+        reports = {warm: self.best(warm, options['runs']) for warm in (False, True)}
+
+        self.stdout.write('{:<34} {:>12} {:>12}'.format('', 'cold', 'warmed up'))
+        self.stdout.write('{:<34} {:>12.0f} {:>12.0f}'.format(
+            'load application ms', reports[False]['load_ms'], reports[True]['load_ms']
+        ))
+        self.stdout.write('{:<34} {:>12} {:>12}'.format(
+            'modules imported', reports[False]['modules'], reports[True]['modules']
+        ))
+        self.stdout.write('{:<34} {:>12} {:>12}'.format(
+            'markdown imported', str(reports[False]['markdown_loaded']), str(reports[True]['markdown_loaded'])
+        ))
+        for cold, warm in zip(reports[False]['requests'], reports[True]['requests']):
+            self.stdout.write('{:<34} {:>12.1f} {:>12.1f}'.format(
+                'first GET {} ms'.format(cold['path']), cold['first_ms'], warm['first_ms']
+            ))
+            self.stdout.write('{:<34} {:>12.1f} {:>12.1f}'.format(
+                '  second GET ms', cold['second_ms'], warm['second_ms']
+            ))
+
+    def best(self, warm, runs):
+        reports = [self.probe(warm) for _ in range(max(runs, 1))]
+        return min(reports, key=lambda report: report['load_ms'] + sum(r['first_ms'] for r in report['requests']))
+
+    def probe(self, warm):
+        env = dict(os.environ, WARM_UP=str(warm), DJANGO_SETTINGS_MODULE='myproject.settings')
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [settings.BASE_DIR, env.get('PYTHONPATH')]))
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE], env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        if result.returncode:
+            raise CommandError('The probe failed:\n{}'.format(result.stderr.decode()))
+        return json.loads(result.stdout.decode().strip().splitlines()[-1])
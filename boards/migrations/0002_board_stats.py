@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.6 on 2026-10-18 16:25
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_board_stats(apps, schema_editor):
+    Board = apps.get_model('boards', 'Board')
+    Topic = apps.get_model('boards', 'Topic')
+    Post = apps.get_model('boards', 'Post')
+
+    topics_counts = dict(
+        Topic.objects.order_by().values('board').annotate(count=Count('pk')).values_list('board', 'count')
+    )
+    posts_counts = dict(
+        Post.objects.order_by().values('topic__board').annotate(count=Count('pk')).values_list('topic__board', 'count')
+    )
+    last_posts = Post.objects.filter(topic__board=OuterRef('pk')).order_by('-created_at').values('pk')[:1]
+    for board_pk, last_post_pk in Board.objects.annotate(last_post_pk=Subquery(last_posts)).values_list('pk', 'last_post_pk'):
+        Board.objects.filter(pk=board_pk).update(
+            topics_count=topics_counts.get(board_pk, 0),
+            posts_count=posts_counts.get(board_pk, 0),
+            last_post_id=last_post_pk
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='last_post',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='boards.Post'),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='topics_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_board_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.6 on 2026-10-18 16:26
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_topic_posts_count(apps, schema_editor):
+    Topic = apps.get_model('boards', 'Topic')
+    Post = apps.get_model('boards', 'Post')
+
+    posts_counts = Post.objects.filter(topic=OuterRef('pk')).order_by().values('topic') \
+        .annotate(count=Count('pk')).values('count')
+    Topic.objects.update(posts_count=Coalesce(Subquery(posts_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0002_board_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topic',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_topic_posts_count, migrations.RunPython.noop),
+    ]
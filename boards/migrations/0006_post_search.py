@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+CREATE_INDEX = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE boards_post_search USING fts5(subject, message, tokenize='porter unicode61')",
+    ],
+    'postgresql': [
+        'CREATE TABLE boards_post_search (post_id integer PRIMARY KEY, document tsvector NOT NULL)',
+        'CREATE INDEX boards_post_search_document_idx ON boards_post_search USING GIN (document)',
+    ],
+}
+
+
+def create_search_index(apps, schema_editor):
+    # Other databases have no index, search falls back to scanning the posts table
+    for sql in CREATE_INDEX.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_INDEX:
+        schema_editor.execute('DROP TABLE boards_post_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0005_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.6 on 2026-10-18 17:08
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0006_post_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryFingerprint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_name', models.CharField(max_length=200)),
+                ('fingerprint', models.CharField(max_length=16)),
+                ('sql', models.TextField()),
+                ('executions', models.PositiveIntegerField(default=0)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('repeated_requests', models.PositiveIntegerField(default=0)),
+                ('max_per_request', models.PositiveIntegerField(default=0)),
+                ('total_time', models.FloatField(default=0)),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField()),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='queryfingerprint',
+            unique_together=set([('view_name', 'fingerprint')]),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.6 on 2026-10-18 19:02
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.utils.timezone
+
+
+def fill_topic_last_edited(apps, schema_editor):
+    Topic = apps.get_model('boards', 'Topic')
+    Post = apps.get_model('boards', 'Post')
+
+    last_edits = Post.objects.filter(topic=OuterRef('pk')).order_by().values('topic') \
+        .annotate(last_edit=Max('updated_at')).values('last_edit')
+    Topic.objects.update(last_edited=Coalesce(Subquery(last_edits), F('last_updated')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0007_query_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topic',
+            name='last_edited',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_topic_last_edited, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='topic',
+            index=models.Index(fields=['board', '-last_edited'], name='topic_board_edited_idx'),
+        ),
+    ]
@@ -2,23 +2,54 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils.text import Truncator
 from django.utils.html import mark_safe
-from markdown import markdown
 import math
 
+from .deletion import tracked_delete
+from .rendering import render_markdown
+
+
+class TrackedDeleteQuerySet(models.QuerySet):
+    def delete(self):
+        with tracked_delete():
+            return super().delete()
+
 
 class Board(models.Model):
     name = models.CharField(max_length=30, unique=True)
     description = models.CharField(max_length=100)
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    topics_count = models.PositiveIntegerField(default=0, editable=False)
+    last_post = models.ForeignKey('Post', null=True, editable=False, related_name='+', on_delete=models.SET_NULL)
+
+    objects = TrackedDeleteQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    def delete(self, *args, **kwargs):
+        with tracked_delete():
+            return super().delete(*args, **kwargs)
+
     def get_posts_count(self):
         return Post.objects.filter(topic__board=self).count()
 
     def get_last_post(self):
         return Post.objects.filter(topic__board=self).order_by('-created_at').first()
 
+    def update_stats(self):
+        """
+            Recount the denormalized statistics of this board from its topics and posts.
+            Used where an incremental update is not possible (topic deletes, moving a topic between boards).
+        """
+        self.posts_count = self.get_posts_count()
+        self.topics_count = self.topics.count()
+        self.last_post = self.get_last_post()
+        Board.objects.filter(pk=self.pk).update(
+            posts_count=self.posts_count,
+            topics_count=self.topics_count,
+            last_post=self.last_post
+        )
+
 
 class Topic(models.Model):
     subject = models.CharField(max_length=255, help_text='The max length is 255 symbols')
@@ -26,13 +57,29 @@ class Topic(models.Model):
     board = models.ForeignKey(Board, related_name='topics', on_delete=models.CASCADE)
     starter = models.ForeignKey(User, related_name='topics')
     views = models.PositiveIntegerField(default=0)
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    # Saving the topic or editing one of its posts, for the conditional GET validators of the pages showing them
+    last_edited = models.DateTimeField(auto_now=True)
+
+    objects = TrackedDeleteQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Board topics list, newest first with the keyset pagination tie-breaker
+            models.Index(fields=['board', '-last_updated', '-id'], name='topic_board_updated_idx'),
+            # Latest edit of a board's topics
+            models.Index(fields=['board', '-last_edited'], name='topic_board_edited_idx'),
+        ]
 
     def __str__(self):
         return self.subject
 
+    def delete(self, *args, **kwargs):
+        with tracked_delete():
+            return super().delete(*args, **kwargs)
+
     def get_page_count(self):
-        count = self.posts.count()
-        pages = count / 20
+        pages = self.posts_count / 20
         return math.ceil(pages)
 
     def has_many_pages(self, count=None):
@@ -47,20 +94,68 @@ class Topic(models.Model):
         return range(1, count + 1)
 
     def get_last_ten_posts(self):
-        return self.posts.order_by('-created_at')[:10]
+        return self.posts.select_related('created_by').order_by('-created_at')[:10]
 
 
 class Post(models.Model):
     message = models.TextField(max_length=2500, help_text='The max length is 2500 symbols')
+    message_html = models.TextField(blank=True, editable=False)
     topic = models.ForeignKey(Topic, related_name='posts', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(null=True)
     created_by = models.ForeignKey(User, related_name='posts')
     updated_by = models.ForeignKey(User, null=True, related_name='+')
 
+    class Meta:
+        indexes = [
+            # Topic posts pages
+            models.Index(fields=['topic', 'created_at'], name='post_topic_created_idx'),
+            # Latest posts of a board, walked newest first and joined to the board's topics
+            models.Index(fields=['-created_at'], name='post_created_idx'),
+        ]
+
     def __str__(self):
         truncated_message = Truncator(self.message)
         return truncated_message.chars(30)
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'message' in update_fields:
+            self.render_message()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'message_html'}
+        super().save(*args, **kwargs)
+
+    def render_message(self):
+        self.message_html = render_markdown(self.message)
+        return self.message_html
+
     def get_message_as_markdown(self):
-        return mark_safe(markdown(self.message, safe_mode='escape'))
+        # Posts written before `message_html` existed are rendered on the fly until `render_posts` reaches them
+        return mark_safe(self.message_html or self.render_message())
+
+
+class QueryFingerprint(models.Model):
+    """
+        Executions of one SQL fingerprint by the requests of one URL name, written by `boards.fingerprints`.
+        `repeated_requests` counts the requests that ran it more than `SQL_FINGERPRINT_REPEAT_THRESHOLD` times.
+    """
+    view_name = models.CharField(max_length=200)
+    fingerprint = models.CharField(max_length=16)
+    sql = models.TextField()
+    executions = models.PositiveIntegerField(default=0)
+    requests = models.PositiveIntegerField(default=0)
+    repeated_requests = models.PositiveIntegerField(default=0)
+    max_per_request = models.PositiveIntegerField(default=0)
+    total_time = models.FloatField(default=0)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('view_name', 'fingerprint')
+
+    def __str__(self):
+        return '{} {}'.format(self.view_name, self.fingerprint)
+
+    def get_executions_per_request(self):
+        return self.executions / self.requests if self.requests else 0
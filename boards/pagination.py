@@ -0,0 +1,116 @@
+import math
+import re
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+CURSOR_RE = re.compile(r'^(?P<value>\d+)-(?P<pk>\d+)$')
+# Largest integer the databases take as a query parameter, SQLite raises OverflowError above it
+MAX_PK = 2 ** 63 - 1
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    """
+        A page of a `KeysetPaginator`, it exposes the part of the `Page` interface used by the templates
+        plus the cursors to the neighbouring pages.
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Keyset page of {} objects>'.format(len(self))
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[-1]) if self.object_list else None
+
+    def previous_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[0]) if self.object_list else None
+
+
+class KeysetPaginator:
+    """
+        Paginates a queryset in descending `(field, pk)` order by seeking past the last row of the previous
+        page instead of using `OFFSET`, so every page costs the same however deep it is.
+        Cursors have the form `<microseconds since epoch>-<pk>`.
+        `count` is only used for the approximate number of pages, no `COUNT(*)` query is issued.
+    """
+
+    def __init__(self, queryset, per_page, field, count=0):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.field = field
+        self.count = count
+
+    @property
+    def num_pages(self):
+        return max(math.ceil(self.count / self.per_page), 1)
+
+    def encode_cursor(self, obj):
+        delta = getattr(obj, self.field) - EPOCH
+        microseconds = (delta.days * 86400 + delta.seconds) * 10 ** 6 + delta.microseconds
+        return '{}-{}'.format(microseconds, obj.pk)
+
+    def decode_cursor(self, cursor):
+        match = CURSOR_RE.match(cursor)
+        if match is None:
+            raise InvalidCursor(cursor)
+        try:
+            value = EPOCH + timedelta(microseconds=int(match.group('value')))
+        except OverflowError:
+            raise InvalidCursor(cursor)
+        pk = int(match.group('pk'))
+        if pk > MAX_PK:
+            raise InvalidCursor(cursor)
+        return value, pk
+
+    def get_queryset(self, after=None):
+        """
+            The rows following the `after` cursor (all rows without it) in page order.
+        """
+        queryset = self.queryset.order_by('-' + self.field, '-pk')
+        if after:
+            value, pk = self.decode_cursor(after)
+            queryset = queryset.filter(Q(**{self.field + '__lt': value}) | Q(**{self.field: value, 'pk__lt': pk}))
+        return queryset
+
+    def page(self, after=None, before=None):
+        if before:
+            value, pk = self.decode_cursor(before)
+            newer = Q(**{self.field + '__gt': value}) | Q(**{self.field: value, 'pk__gt': pk})
+            object_list = list(self.queryset.filter(newer).order_by(self.field, 'pk')[:self.per_page + 1])
+            if len(object_list) <= self.per_page:
+                # Nothing is left before this page, the first page is served instead of a partial one
+                return self.page()
+            return KeysetPage(object_list[:self.per_page][::-1], self, has_next=True, has_previous=True)
+
+        object_list = list(self.get_queryset(after)[:self.per_page + 1])
+        has_next = len(object_list) > self.per_page
+        return KeysetPage(object_list[:self.per_page], self, has_next=has_next, has_previous=bool(after))
@@ -0,0 +1,57 @@
+"""
+    Opt-in profiling of live requests.
+
+    `ProfilingMiddleware` runs a `PROFILING_SAMPLE_RATE` fraction of the requests, and every request carrying a
+    valid signed `X-Profile` header (see `profile_report --issue-header`), under cProfile. The dumps go to
+    `PROFILING_DIRECTORY/<url name>/`, `profile_report` merges them per URL name.
+"""
+import cProfile
+import os
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+
+HEADER = 'HTTP_X_PROFILE'
+SALT = 'boards.profiling'
+
+
+def issue_header_value():
+    return signing.TimestampSigner(salt=SALT).sign('profile')
+
+
+def is_valid_header(value):
+    try:
+        signing.TimestampSigner(salt=SALT).unsign(value, max_age=settings.PROFILING_HEADER_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def get_dump_directory(view_name):
+    # `boards:topic_posts` becomes `boards.topic_posts`, colons are not allowed in Windows paths
+    return os.path.join(settings.PROFILING_DIRECTORY, (view_name or 'unresolved').replace(':', '.'))
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        response = profiler.runcall(self.get_response, request)
+        match = getattr(request, 'resolver_match', None)
+        directory = get_dump_directory(match.view_name if match is not None else None)
+        os.makedirs(directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(directory, '{}-{}.prof'.format(int(time.time()), uuid.uuid4().hex[:8])))
+        return response
+
+    def should_profile(self, request):
+        if HEADER in request.META:
+            return is_valid_header(request.META[HEADER])
+        return random.random() < settings.PROFILING_SAMPLE_RATE
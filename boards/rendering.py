@@ -0,0 +1,86 @@
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+class MarkdownRenderer:
+    """
+        Markdown 2.6 with raw HTML escaped, the way posts have always been rendered.
+    """
+
+    def render(self, text):
+        # Imported on first use, Markdown pulls in dozens of modules that management commands never need
+        from markdown import markdown
+
+        return markdown(text, safe_mode='escape')
+
+
+class CachedMarkdownRenderer:
+    """
+        Same output as `MarkdownRenderer`, but each thread reuses one `Markdown` instance
+        instead of building the whole processor pipeline for every post.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def render(self, text):
+        md = getattr(self._local, 'md', None)
+        if md is None:
+            from markdown import Markdown
+
+            md = self._local.md = Markdown(safe_mode='escape')
+        return md.reset().convert(text)
+
+
+class MistuneRenderer:
+    """
+        Escapes raw HTML before rendering with mistune, several times faster than Markdown 2.6.
+        Requires mistune 0.8, pinned in requirements.txt, mistune 2 has no `Renderer` with `escape`.
+    """
+
+    def __init__(self):
+        try:
+            import mistune
+        except ImportError:
+            raise ImproperlyConfigured('The "mistune" markdown renderer requires the mistune package')
+        if not mistune.__version__.startswith('0.8.'):
+            raise ImproperlyConfigured(
+                'The "mistune" markdown renderer requires mistune 0.8, found {}'.format(mistune.__version__)
+            )
+        self._mistune = mistune
+        self._local = threading.local()
+
+    def render(self, text):
+        md = getattr(self._local, 'md', None)
+        if md is None:
+            renderer = self._mistune.Renderer(escape=True, use_xhtml=True)
+            md = self._local.md = self._mistune.Markdown(renderer=renderer)
+        return md(text)
+
+
+RENDERERS = {
+    'markdown': MarkdownRenderer,
+    'markdown_cached': CachedMarkdownRenderer,
+    'mistune': MistuneRenderer,
+}
+
+_renderers = {}
+
+
+def get_renderer(name=None):
+    name = name or settings.MARKDOWN_RENDERER
+    if name not in _renderers:
+        try:
+            renderer_class = RENDERERS[name]
+        except KeyError:
+            raise ImproperlyConfigured('Unknown markdown renderer "{}", choose one of: {}'.format(
+                name, ', '.join(sorted(RENDERERS))
+            ))
+        _renderers[name] = renderer_class()
+    return _renderers[name]
+
+
+def render_markdown(text):
+    return get_renderer().render(text)
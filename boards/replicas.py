@@ -0,0 +1,100 @@
+"""
+    Read replicas for the forum pages.
+
+    `ReplicaReadsMixin` sends the reads of a view, template rendering included, to one of
+    `settings.REPLICA_DATABASES`. Everything else keeps using the primary. The views that write set a cookie
+    with `pin_to_primary`, and while it lasts (`REPLICA_PIN_SECONDS`) that browser reads from the primary
+    too, so users always see their own posts even when the replicas lag behind.
+"""
+import random
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+PIN_COOKIE = 'primary_pin'
+
+# Sessions and users are always read from the primary, a user who just signed up must find their account
+REPLICA_APPS = {'accounts', 'boards'}
+
+_state = threading.local()
+
+
+def get_replicas():
+    # A replica pointing at the primary's database, like the test mirrors, is read through the primary's
+    # connection, another connection would not see the rows of an open transaction
+    primary = connections['default'].settings_dict
+    return [
+        alias for alias in settings.REPLICA_DATABASES
+        if any(connections[alias].settings_dict[key] != primary[key] for key in ('NAME', 'HOST', 'PORT'))
+    ]
+
+
+@contextmanager
+def replica_reads():
+    previous = getattr(_state, 'replica', None)
+    replicas = get_replicas()
+    _state.replica = random.choice(replicas) if replicas else None
+    try:
+        yield
+    finally:
+        _state.replica = previous
+
+
+def is_pinned(request):
+    return PIN_COOKIE in request.COOKIES
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = getattr(_state, 'replica', None)
+        if replica is not None and model._meta.app_label in REPLICA_APPS:
+            return replica
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary
+        return True
+
+
+def replica_reads_view(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if is_pinned(request) or not settings.REPLICA_DATABASES:
+            return view(request, *args, **kwargs)
+        with replica_reads():
+            response = view(request, *args, **kwargs)
+            # Template responses run most of their queries while rendering
+            if hasattr(response, 'render') and callable(response.render):
+                response.render()
+        return response
+    return wrapper
+
+
+class ReplicaReadsMixin:
+    """
+        Wraps the whole view, conditional GET validators included, so the validators and the page
+        come from the same database.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return replica_reads_view(super().as_view(**initkwargs))
+
+
+def pin_to_primary(view):
+    """
+        Pin the browser to the primary after a successful write, i.e. when the view redirects.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if request.method == 'POST' and response.status_code == 302:
+            response.set_cookie(PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True)
+        return response
+    return wrapper
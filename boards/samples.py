@@ -0,0 +1,51 @@
+"""
+    Random but realistic forum content for benchmarks and synthetic datasets.
+"""
+WORDS = (
+    'django python query index cache template view model migration board topic post reply page server '
+    'database request response user profile session markdown render the a of to and in is it that for '
+    'with on as this be are was not but can have you we they will would should could fast slow'
+).split()
+
+INLINE = ('**{}**', '_{}_', '`{}`', '[{}](https://example.com/docs)', '<b>{}</b>', '{} & co')
+
+
+def sentence(rng, words=12):
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        if rng.random() < 0.08:
+            word = rng.choice(INLINE).format(word)
+        parts.append(word)
+    return ' '.join(parts).capitalize() + '.'
+
+
+def paragraph(rng):
+    return ' '.join(sentence(rng, rng.randint(6, 18)) for _ in range(rng.randint(2, 5)))
+
+
+def block(rng):
+    kind = rng.random()
+    if kind < 0.15:
+        return '\n'.join('* ' + sentence(rng, rng.randint(3, 8)) for _ in range(rng.randint(2, 5)))
+    if kind < 0.25:
+        return '\n'.join('    ' + sentence(rng, rng.randint(2, 6)) for _ in range(rng.randint(2, 6)))
+    if kind < 0.3:
+        return '> ' + sentence(rng)
+    if kind < 0.35:
+        return '## ' + sentence(rng, 4)
+    return paragraph(rng)
+
+
+def message(rng, length=2500):
+    """
+        A markdown message of roughly `length` characters (never more) made of paragraphs, lists,
+        code blocks, quotes and headers, with some inline markup and raw HTML.
+    """
+    blocks = []
+    size = 0
+    while size < length:
+        text = block(rng)
+        blocks.append(text)
+        size += len(text) + 2
+    return '\n\n'.join(blocks)[:length]
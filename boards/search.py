@@ -0,0 +1,200 @@
+import re
+
+from django.db import connection
+from django.db.models import Min, Q
+
+from .models import Post
+
+TERM_RE = re.compile(r'\w+')
+
+
+def get_terms(query):
+    return TERM_RE.findall(query or '')
+
+
+def get_index_rows(posts):
+    """
+        `(post pk, subject, message)` rows for the index. Only the first post of a topic carries its subject,
+        otherwise a topic matching by subject would fill the results with every one of its replies.
+    """
+    posts = list(posts)
+    if not posts:
+        return []
+    first_posts = set(
+        Post.objects.filter(topic_id__in={post.topic_id for post in posts}).order_by().values('topic')
+            .annotate(first=Min('pk')).values_list('first', flat=True)
+    )
+    return [
+        (post.pk, post.topic.subject if post.pk in first_posts else '', post.message)
+        for post in posts
+    ]
+
+
+class SQLiteSearchBackend:
+    """
+        An FTS5 table keyed by the post's rowid, ranked with bm25 where subject matches weigh more than
+        message matches.
+    """
+    indexed = True
+
+    def index(self, rows):
+        with connection.cursor() as cursor:
+            cursor.executemany('DELETE FROM boards_post_search WHERE rowid = %s', [(row[0], ) for row in rows])
+            cursor.executemany(
+                'INSERT INTO boards_post_search (rowid, subject, message) VALUES (%s, %s, %s)', rows
+            )
+
+    def remove(self, pks):
+        with connection.cursor() as cursor:
+            cursor.executemany('DELETE FROM boards_post_search WHERE rowid = %s', [(pk, ) for pk in pks])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM boards_post_search')
+
+    def match(self, terms):
+        # Every term is quoted so user input can never be parsed as FTS5 query syntax
+        return ' '.join('"{}"'.format(term) for term in terms)
+
+    def count(self, terms):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*) FROM boards_post_search WHERE boards_post_search MATCH %s', [self.match(terms)]
+            )
+            return cursor.fetchone()[0]
+
+    def ranked_pks(self, terms, offset, limit):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT rowid FROM boards_post_search WHERE boards_post_search MATCH %s '
+                'ORDER BY bm25(boards_post_search, 4.0, 1.0), rowid DESC LIMIT %s OFFSET %s',
+                [self.match(terms), limit, offset]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    """
+        A `tsvector` per post behind a GIN index, the subject weighted 'A' and the message 'B',
+        ranked with `ts_rank`.
+    """
+    indexed = True
+
+    def index(self, rows):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO boards_post_search (post_id, document) VALUES "
+                "(%s, setweight(to_tsvector('english', %s), 'A') || setweight(to_tsvector('english', %s), 'B')) "
+                "ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document",
+                rows
+            )
+
+    def remove(self, pks):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM boards_post_search WHERE post_id = ANY(%s)', [list(pks)])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute('TRUNCATE boards_post_search')
+
+    def count(self, terms):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM boards_post_search WHERE document @@ plainto_tsquery('english', %s)",
+                [' '.join(terms)]
+            )
+            return cursor.fetchone()[0]
+
+    def ranked_pks(self, terms, offset, limit):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT post_id FROM boards_post_search, plainto_tsquery('english', %s) query "
+                "WHERE document @@ query ORDER BY ts_rank(document, query) DESC, post_id DESC LIMIT %s OFFSET %s",
+                [' '.join(terms), limit, offset]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class FallbackSearchBackend:
+    """
+        Used on databases without a supported full-text index: every term has to appear in the message or
+        the subject, newest posts first. It scans the posts table, so it only suits small forums.
+    """
+    indexed = False
+
+    def index(self, rows):
+        pass
+
+    def remove(self, pks):
+        pass
+
+    def clear(self):
+        pass
+
+    def get_queryset(self, terms):
+        queryset = Post.objects.all()
+        for term in terms:
+            queryset = queryset.filter(Q(message__icontains=term) | Q(topic__subject__icontains=term))
+        return queryset
+
+    def count(self, terms):
+        return self.get_queryset(terms).count()
+
+    def ranked_pks(self, terms, offset, limit):
+        return list(self.get_queryset(terms).order_by('-created_at', '-pk')
+                    .values_list('pk', flat=True)[offset:offset + limit])
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_backend():
+    return BACKENDS.get(connection.vendor, FallbackSearchBackend)()
+
+
+def index_posts(posts):
+    backend = get_backend()
+    if backend.indexed:
+        rows = get_index_rows(posts)
+        if rows:
+            backend.index(rows)
+
+
+def remove_posts(pks):
+    backend = get_backend()
+    if backend.indexed:
+        backend.remove(pks)
+
+
+class SearchResults:
+    """
+        The ranked posts matching a query. Sliced and counted lazily, so it can be handed to a `Paginator`
+        and only the requested page is fetched.
+    """
+
+    def __init__(self, query):
+        self.terms = get_terms(query)
+        self.backend = get_backend()
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.backend.count(self.terms) if self.terms else 0
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+        if not self.terms or stop <= start:
+            return []
+        pks = self.backend.ranked_pks(self.terms, start, stop - start)
+        posts = Post.objects.select_related('topic__board', 'created_by').in_bulk(pks)
+        return [posts[pk] for pk in pks if pk in posts]
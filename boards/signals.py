@@ -0,0 +1,117 @@
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import deletion
+from .connections import check_connections, connection_stats, track_use
+from .models import Board, Post, Topic
+from .search import index_posts, remove_posts
+
+
+@receiver(post_save, sender=Topic)
+def topic_created(sender, instance, created, **kwargs):
+    if created:
+        Board.objects.filter(pk=instance.board_id).update(topics_count=F('topics_count') + 1)
+
+
+@receiver(pre_delete, sender=Topic)
+def topic_deleting(sender, instance, **kwargs):
+    deletion.topic_deleting(instance)
+
+
+@receiver(post_delete, sender=Topic)
+def topic_deleted(sender, instance, **kwargs):
+    board_id = deletion.topic_deleted(instance.pk)
+    if board_id is not None:
+        Board(pk=board_id).update_stats()
+
+
+@receiver(pre_delete, sender=Board)
+def board_deleting(sender, instance, **kwargs):
+    deletion.board_deleting(instance.pk)
+
+
+@receiver(post_delete, sender=Board)
+def board_deleted(sender, instance, **kwargs):
+    deletion.board_deleted(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, **kwargs):
+    if created:
+        Topic.objects.filter(pk=instance.topic_id).update(
+            posts_count=F('posts_count') + 1,
+            last_updated=instance.created_at
+        )
+        Board.objects.filter(pk=instance.topic.board_id).update(posts_count=F('posts_count') + 1, last_post=instance)
+
+
+@receiver(post_save, sender=Post)
+def post_edited(sender, instance, created, update_fields, **kwargs):
+    if not created and (update_fields is None or 'message' in update_fields):
+        Topic.objects.filter(pk=instance.topic_id).update(last_edited=timezone.now())
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    if deletion.is_deleting_topic(instance.topic_id):
+        # The whole topic is being deleted, `topic_deleted` recounts the board
+        return
+    row = Topic.objects.filter(pk=instance.topic_id).values_list('board_id', 'board__last_post_id').first()
+    if row is None:
+        return
+    board_id, last_post_id = row
+    Topic.objects.filter(pk=instance.topic_id).update(posts_count=F('posts_count') - 1)
+    Board.objects.filter(pk=board_id).update(posts_count=F('posts_count') - 1)
+    if last_post_id is None:
+        # `last_post` is set to NULL when the post it pointed to is deleted
+        board = Board(pk=board_id)
+        Board.objects.filter(pk=board_id).update(last_post=board.get_last_post())
+
+
+@receiver(post_save, sender=Post)
+def post_saved_index(sender, instance, update_fields, **kwargs):
+    if update_fields is None or 'message' in update_fields:
+        index_posts([instance])
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted_index(sender, instance, **kwargs):
+    remove_posts([instance.pk])
+    if deletion.is_deleting_topic(instance.topic_id):
+        return
+    # The next post of the topic becomes its first when the first one is deleted, and takes over the subject
+    first_post = Post.objects.filter(topic_id=instance.topic_id).select_related('topic').order_by('pk').first()
+    if first_post is not None and first_post.pk > instance.pk:
+        index_posts([first_post])
+
+
+@receiver(post_save, sender=Topic)
+def topic_saved_index(sender, instance, created, update_fields, **kwargs):
+    # A new topic has no posts yet, its first post brings the subject into the index
+    if not created and (update_fields is None or 'subject' in update_fields):
+        first_post = instance.posts.order_by('pk').first()
+        if first_post is not None:
+            first_post.topic = instance
+            index_posts([first_post])
+
+
+@receiver(connection_created)
+def database_connected(sender, connection, **kwargs):
+    connection_stats.connected(connection.alias)
+    track_use(connection)
+
+
+@receiver(request_started)
+def request_started_check_connections(sender, **kwargs):
+    # Connected after Django's own `close_old_connections`, the obsolete connections are already closed
+    check_connections()
+
+
+@receiver(request_started)
+def request_started_reset_deletes(sender, **kwargs):
+    # Deletes cascading from other models, like users, are not run in `tracked_delete`
+    deletion.reset()
@@ -1,19 +1,34 @@
-import hashlib
+from functools import lru_cache
 from urllib.parse import urlencode
 
 from django import template
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+
+from accounts.models import hash_email
 
 register = template.Library()
 
 
-@register.filter
-def gravatar(user):
-    email = user.email.lower().encode('utf-8')
+@lru_cache(maxsize=1024)
+def gravatar_url(email_hash):
     default = 'mm'
     size = 256
     url = 'https://www.gravatar.com/avatar/{md5}?{params}'.format(
-        md5=hashlib.md5(email).hexdigest(),
+        md5=email_hash,
         params=urlencode({'d': default, 's': str(size)})
     )
-    return url
\ No newline at end of file
+    return url
+
+
+@register.filter
+def gravatar(user):
+    """
+        Uses the email hash stored on the user's profile, load it with `select_related('profile')`
+        to avoid a query per user. Users without a profile get their email hashed on the fly.
+    """
+    try:
+        email_hash = user.profile.email_hash
+    except ObjectDoesNotExist:
+        email_hash = ''
+    return gravatar_url(email_hash or hash_email(user.email))
@@ -0,0 +1,16 @@
+from django.test.runner import DiscoverRunner
+
+from ..counters import view_counter
+from ..fingerprints import fingerprint_stats
+
+
+class TestRunner(DiscoverRunner):
+    """
+        Drops the view hits and query fingerprints still buffered before the test databases are destroyed.
+        Their exit flushes would otherwise write them to the databases the settings point at again by then.
+    """
+
+    def teardown_databases(self, old_config, **kwargs):
+        view_counter.reset()
+        fingerprint_stats.reset()
+        super().teardown_databases(old_config, **kwargs)
@@ -0,0 +1,107 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from .utils import query_budget
+from ..models import Board, Post, Topic
+
+
+class AdminTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@mail.com', password='test12345')
+        self.client.login(username='admin', password='test12345')
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.admin)
+        Post.objects.create(message='Hello', topic=self.topic, created_by=self.admin)
+
+    def create_posts(self, count):
+        # Every post by another user, each one a choice for a user `<select>`
+        for i in range(self.topic.posts.count() - 1, count):
+            user = User.objects.create_user(username='user{}'.format(i), email='user{}@mail.com'.format(i))
+            Post.objects.create(message='Post {}'.format(i), topic=self.topic, created_by=user)
+
+    def assertQueryBudget(self, budget, url, create_rows):
+        # The first request loads the session and the admin's user
+        self.client.get(url)
+        for rows in (1, 30):
+            create_rows(rows)
+            with query_budget(budget):
+                response = self.client.get(url)
+            self.assertEquals(response.status_code, 200)
+        return response
+
+
+class TopicAdminTests(AdminTestCase):
+    def test_change_page(self):
+        url = reverse('admin:boards_topic_change', args=(self.topic.pk, ))
+        response = self.assertQueryBudget(8, url, self.create_posts)
+        # Users are picked by id
+        self.assertContains(response, 'class="vForeignKeyRawIdAdminField"')
+        self.assertNotContains(response, '<select name="starter"')
+        # Only the latest posts, read only
+        self.assertContains(response, 'Latest 20 posts')
+        self.assertContains(response, 'Post 29')
+        self.assertNotContains(response, 'Post 0<')
+        self.assertNotContains(response, 'name="posts-0-message"')
+
+    def test_changelist(self):
+        def create_topics(count):
+            for i in range(self.board.topics.count() - 1, count):
+                Topic.objects.create(subject='Topic {}'.format(i), board=self.board, starter=self.admin)
+
+        response = self.assertQueryBudget(6, reverse('admin:boards_topic_changelist'), create_topics)
+        self.assertContains(response, 'Topic 0')
+
+    def test_search(self):
+        other = User.objects.create_user(username='jane', email='jane@mail.com')
+        topic = Topic.objects.create(subject='Other', board=self.board, starter=other)
+        url = reverse('admin:boards_topic_changelist')
+        self.assertEquals(list(self.client.get(url, {'q': 'jane'}).context['cl'].result_list), [topic])
+        self.assertEquals(list(self.client.get(url, {'q': str(self.topic.pk)}).context['cl'].result_list), [self.topic])
+        self.assertEquals(list(self.client.get(url, {'q': 'Other'}).context['cl'].result_list), [])
+
+    def test_moving_a_topic_recounts_both_boards(self):
+        board = Board.objects.create(name='Python', description='Python board.')
+        response = self.client.post(reverse('admin:boards_topic_change', args=(self.topic.pk, )), {
+            'subject': self.topic.subject,
+            'board': board.pk,
+            'starter': self.admin.pk,
+            'views': 0,
+        })
+        self.assertEquals(response.status_code, 302)
+        self.board.refresh_from_db()
+        board.refresh_from_db()
+        self.assertEquals((self.board.topics_count, self.board.posts_count), (0, 0))
+        self.assertEquals((board.topics_count, board.posts_count), (1, 1))
+        self.assertEquals(self.topic.posts.count(), 1)
+
+
+class PostAdminTests(AdminTestCase):
+    def test_change_page(self):
+        post = self.topic.posts.get()
+        url = reverse('admin:boards_post_change', args=(post.pk, ))
+        response = self.assertQueryBudget(7, url, self.create_posts)
+        self.assertNotContains(response, '<select name="created_by"')
+        self.assertNotContains(response, 'name="topic"')
+
+    def test_topic_and_author_are_kept(self):
+        post = self.topic.posts.get()
+        other_topic = Topic.objects.create(subject='Other', board=self.board, starter=self.admin)
+        other_user = User.objects.create_user(username='jane', email='jane@mail.com')
+        response = self.client.post(reverse('admin:boards_post_change', args=(post.pk, )), {
+            'message': 'Edited',
+            'updated_at_0': '2017-10-01',
+            'updated_at_1': '12:00:00',
+            'updated_by': self.admin.pk,
+            'topic': other_topic.pk,
+            'created_by': other_user.pk,
+        })
+        self.assertEquals(response.status_code, 302)
+        post.refresh_from_db()
+        self.assertEquals((post.message, post.topic, post.created_by), ('Edited', self.topic, self.admin))
+        self.topic.refresh_from_db()
+        self.assertEquals(self.topic.posts_count, 1)
+
+    def test_changelist(self):
+        response = self.assertQueryBudget(6, reverse('admin:boards_post_changelist'), self.create_posts)
+        self.assertContains(response, 'Post 0')
@@ -0,0 +1,172 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Profile
+from .. import deletion
+from ..models import Board, Post, Topic
+from ..throttling import memory_buckets
+
+
+class BoardStatsTestCase(TestCase):
+    def setUp(self):
+        memory_buckets.reset()
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        self.first_post = Post.objects.create(message='First', topic=self.topic, created_by=self.user)
+        self.second_post = Post.objects.create(message='Second', topic=self.topic, created_by=self.user)
+
+    def assertStats(self, topics_count, posts_count, last_post):
+        self.board.refresh_from_db()
+        self.assertEquals(self.board.topics_count, topics_count)
+        self.assertEquals(self.board.posts_count, posts_count)
+        self.assertEquals(self.board.last_post, last_post)
+
+
+class BoardStatsTests(BoardStatsTestCase):
+    def test_created_topics_and_posts_are_counted(self):
+        self.assertStats(1, 2, self.second_post)
+        self.topic.refresh_from_db()
+        self.assertEquals(self.topic.posts_count, 2)
+
+    def test_new_topic_view(self):
+        self.client.login(username='john', password='test12345')
+        url = reverse('boards:new_topic', kwargs={'pk': self.board.pk})
+        self.client.post(url, {'subject': 'Test', 'message': 'Test message.'})
+        self.assertStats(2, 3, Post.objects.latest('pk'))
+
+    def test_reply_topic_view(self):
+        self.client.login(username='john', password='test12345')
+        url = reverse('boards:reply_topic', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.client.post(url, {'message': 'hello, world!'})
+        self.assertStats(1, 3, Post.objects.latest('pk'))
+
+    def test_deleting_the_last_post(self):
+        self.second_post.delete()
+        self.assertStats(1, 1, self.first_post)
+        self.topic.refresh_from_db()
+        self.assertEquals(self.topic.posts_count, 1)
+
+    def test_deleting_an_older_post(self):
+        self.first_post.delete()
+        self.assertStats(1, 1, self.second_post)
+
+    def test_deleting_a_post_queries(self):
+        # The delete and its boards pointing at the post, the board lookup, the two counts, the author's count,
+        # the search index and the next post, indexed with the subject as the new first post
+        with self.assertNumQueries(11):
+            self.first_post.delete()
+
+    def test_deleting_a_topic(self):
+        self.topic.delete()
+        self.assertStats(0, 0, None)
+
+    def test_deleting_a_topic_recounts_the_board_once(self):
+        for i in range(10):
+            Post.objects.create(message='Post {}'.format(i), topic=self.topic, created_by=self.user)
+        other_topic = Topic.objects.create(subject='Other', board=self.board, starter=self.user)
+        other_post = Post.objects.create(message='Other', topic=other_topic, created_by=self.user)
+        # The posts are still removed from the search index and their authors' counts one by one
+        with self.assertNumQueries(32):
+            self.topic.delete()
+        self.assertStats(1, 1, other_post)
+        # Posts deleted on their own are counted again
+        other_post.delete()
+        self.assertStats(1, 0, None)
+
+    def get_recounts(self, delete):
+        with CaptureQueriesContext(connection) as context:
+            delete()
+        return [query for query in context if query['sql'].startswith('UPDATE "boards_board" SET "posts_count" = ')]
+
+    def test_deleting_many_topics_recounts_each_board_once(self):
+        board = Board.objects.create(name='Python', description='Python board.')
+        for i in range(5):
+            for topic_board in (self.board, board):
+                topic = Topic.objects.create(subject='Topic {}'.format(i), board=topic_board, starter=self.user)
+                Post.objects.create(message='Post {}'.format(i), topic=topic, created_by=self.user)
+        kept = Topic.objects.create(subject='Kept', board=self.board, starter=self.user)
+        kept_post = Post.objects.create(message='Kept', topic=kept, created_by=self.user)
+        self.assertEquals(len(self.get_recounts(Topic.objects.exclude(pk=kept.pk).delete)), 2)
+        self.assertStats(1, 1, kept_post)
+        board.refresh_from_db()
+        self.assertEquals((board.topics_count, board.posts_count, board.last_post), (0, 0, None))
+
+    def test_deleted_board_is_not_recounted(self):
+        for i in range(5):
+            topic = Topic.objects.create(subject='Topic {}'.format(i), board=self.board, starter=self.user)
+            Post.objects.create(message='Post {}'.format(i), topic=topic, created_by=self.user)
+        self.assertEquals(self.get_recounts(self.board.delete), [])
+        self.assertFalse(Topic.objects.exists())
+
+    def test_failed_delete_is_forgotten(self):
+        with mock.patch('boards.signals.remove_posts', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                self.topic.delete()
+        self.assertFalse(deletion.is_deleting_topic(self.topic.pk))
+        self.second_post.delete()
+        self.assertStats(1, 1, self.first_post)
+        self.topic.refresh_from_db()
+        self.assertEquals(self.topic.posts_count, 1)
+
+
+class ReconcileStatsTests(BoardStatsTestCase):
+    def test_reconcile_rebuilds_stats(self):
+        Board.objects.update(topics_count=10, posts_count=10, last_post=None)
+        Topic.objects.update(posts_count=10)
+        empty_topic = Topic.objects.create(subject='Empty', board=self.board, starter=self.user)
+        call_command('reconcile_stats', stdout=StringIO())
+        self.assertStats(2, 2, self.second_post)
+        self.topic.refresh_from_db()
+        empty_topic.refresh_from_db()
+        self.assertEquals(self.topic.posts_count, 2)
+        self.assertEquals(empty_topic.posts_count, 0)
+
+    def test_boards_are_updated_in_one_query(self):
+        boards = [Board.objects.create(name='Board {}'.format(i), description='Board.') for i in range(3)]
+        Board.objects.update(topics_count=10, posts_count=10)
+        with CaptureQueriesContext(connection) as context:
+            call_command('reconcile_stats', stdout=StringIO())
+        self.assertEquals(len([query for query in context if query['sql'].startswith('UPDATE "boards_board"')]), 1)
+        self.assertStats(1, 2, self.second_post)
+        for board in boards:
+            board.refresh_from_db()
+            self.assertEquals((board.topics_count, board.posts_count, board.last_post), (0, 0, None))
+
+    def test_reconcile_rebuilds_author_posts_counts(self):
+        Profile.objects.all().delete()
+        call_command('reconcile_stats', stdout=StringIO())
+        self.assertEquals(Profile.objects.get(user=self.user).posts_count, 2)
+
+
+class HomeQueriesTests(BoardStatsTestCase):
+    def test_home_queries_do_not_depend_on_boards_count(self):
+        for i in range(5):
+            board = Board.objects.create(name='Board {}'.format(i), description='Board.')
+            topic = Topic.objects.create(subject='Topic', board=board, starter=self.user)
+            Post.objects.create(message='Message', topic=topic, created_by=self.user)
+        with self.assertNumQueries(1):
+            self.client.get(reverse('boards:home'))
+
+
+class TopicPagesTests(BoardStatsTestCase):
+    def test_page_links_do_not_count_posts(self):
+        Topic.objects.filter(pk=self.topic.pk).update(posts_count=200)
+        topic = Topic.objects.get(pk=self.topic.pk)
+        with self.assertNumQueries(0):
+            self.assertEquals(topic.get_page_count(), 10)
+            self.assertTrue(topic.has_many_pages())
+            self.assertEquals(list(topic.get_page_range()), [1, 2, 3, 4])
+
+    def test_board_topics_view_shows_last_page_link(self):
+        Topic.objects.filter(pk=self.topic.pk).update(posts_count=200)
+        url = reverse('boards:board_topics', kwargs={'pk': self.board.pk})
+        response = self.client.get(url)
+        self.assertContains(response, '?page=10">Last Page</a>')
@@ -0,0 +1,130 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from ..counters import view_counter
+from ..models import Board, Post, Topic
+from ..throttling import memory_buckets
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        memory_buckets.reset()
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        self.post = Post.objects.create(message='Hello', topic=self.topic, created_by=self.user)
+        self.client.login(username='john', password='test12345')
+
+    def get_conditional(self, url):
+        response = self.client.get(url)
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def get_revalidated(self, url, change):
+        response = self.client.get(url)
+        change()
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def reply(self):
+        url = reverse('boards:reply_topic', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.client.post(url, {'message': 'A reply'})
+
+    def edit_subject(self):
+        # As in the admin, which moves none of the counters
+        self.topic.subject = 'Edited subject'
+        self.topic.save()
+
+
+class TopicPostsConditionalGetTests(ConditionalGetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+
+    def test_validators(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_not_modified(self):
+        response = self.get_conditional(self.url)
+        self.assertEquals(response.status_code, 304)
+        self.assertFalse(response.content)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEquals(response.status_code, 304)
+
+    def test_reply(self):
+        self.assertEquals(self.get_revalidated(self.url, self.reply).status_code, 200)
+
+    def test_edit(self):
+        def edit():
+            url = reverse('boards:edit_post', kwargs={
+                'board_pk': self.board.pk,
+                'topic_pk': self.topic.pk,
+                'post_pk': self.post.pk
+            })
+            self.client.post(url, {'message': 'Edited'})
+        self.assertEquals(self.get_revalidated(self.url, edit).status_code, 200)
+
+    def test_edit_without_updated_at(self):
+        def edit():
+            self.post.message = 'Edited'
+            self.post.save()
+        self.assertEquals(self.get_revalidated(self.url, edit).status_code, 200)
+
+    def test_subject_edit(self):
+        self.assertEquals(self.get_revalidated(self.url, self.edit_subject).status_code, 200)
+
+    def test_not_modified_queries(self):
+        etag = self.client.get(self.url)['ETag']
+        # The session, the user and the topic's dates and count, none over its posts
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 304)
+
+    def test_view_count_does_not_change_validators(self):
+        def view():
+            self.client_class().get(self.url)
+            view_counter.flush()
+        self.assertEquals(self.get_revalidated(self.url, view).status_code, 304)
+
+    def test_other_page(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, {'page': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertNotEquals(response.status_code, 304)
+
+    def test_other_user(self):
+        self.assertEquals(self.get_revalidated(self.url, self.client.logout).status_code, 200)
+
+    def test_missing_topic(self):
+        url = reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': 99})
+        self.assertEquals(self.client.get(url).status_code, 404)
+
+
+class BoardTopicsConditionalGetTests(ConditionalGetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('boards:board_topics', kwargs={'pk': self.board.pk})
+
+    def test_not_modified(self):
+        self.assertEquals(self.get_conditional(self.url).status_code, 304)
+
+    def test_new_topic(self):
+        def new_topic():
+            url = reverse('boards:new_topic', kwargs={'pk': self.board.pk})
+            self.client.post(url, {'subject': 'Another', 'message': 'Message'})
+        self.assertEquals(self.get_revalidated(self.url, new_topic).status_code, 200)
+
+    def test_reply(self):
+        self.assertEquals(self.get_revalidated(self.url, self.reply).status_code, 200)
+
+    def test_subject_edit(self):
+        self.assertEquals(self.get_revalidated(self.url, self.edit_subject).status_code, 200)
+
+    def test_missing_board(self):
+        url = reverse('boards:board_topics', kwargs={'pk': 99})
+        self.assertEquals(self.client.get(url).status_code, 404)
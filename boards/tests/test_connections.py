@@ -0,0 +1,130 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.signals import request_started
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from ..connections import ConnectionStats, check_connections, connection_stats
+from ..models import Board
+
+
+class ConnectionStatsTests(TestCase):
+    def test_connects_and_reconnects(self):
+        stats = ConnectionStats()
+        stats.connected('default')
+        stats.connected('default')
+        stats.connected('replica_1')
+        thread = threading.Thread(target=stats.connected, args=('default', ))
+        thread.start()
+        thread.join()
+        self.assertEquals(stats.snapshot(), {
+            'default': {'connects': 2, 'reconnects': 1},
+            'replica_1': {'connects': 1},
+        })
+
+
+class FakeConnection:
+    def __init__(self, usable=True, in_atomic_block=False):
+        self.alias = 'default'
+        self.connection = object()
+        self.in_atomic_block = in_atomic_block
+        self.usable = usable
+
+    def is_usable(self):
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+class CheckConnectionsTests(TestCase):
+    def setUp(self):
+        connection_stats.reset()
+
+    def check(self, fake):
+        with mock.patch('boards.connections.connections') as connections:
+            connections.all.return_value = [fake]
+            check_connections()
+        return connection_stats.snapshot().get('default', {})
+
+    def test_usable_connection_is_reused(self):
+        fake = FakeConnection()
+        self.assertEquals(self.check(fake), {'checkouts': 1, 'health_checks': 1})
+        self.assertIsNotNone(fake.connection)
+
+    def test_broken_connection_is_closed(self):
+        fake = FakeConnection(usable=False)
+        self.assertEquals(self.check(fake), {'checkouts': 1, 'health_checks': 1, 'health_failures': 1})
+        self.assertIsNone(fake.connection)
+
+    def test_recently_used_connection_is_not_pinged(self):
+        fake = FakeConnection(usable=False)
+        fake.last_used = time.monotonic()
+        self.assertEquals(self.check(fake), {'checkouts': 1})
+        self.assertIsNotNone(fake.connection)
+
+    def test_ping_counts_as_use(self):
+        fake = FakeConnection()
+        self.check(fake)
+        self.assertEquals(self.check(fake), {'checkouts': 2, 'health_checks': 1})
+
+    def test_connection_in_transaction_is_left_alone(self):
+        fake = FakeConnection(usable=False, in_atomic_block=True)
+        self.assertEquals(self.check(fake), {})
+        self.assertIsNotNone(fake.connection)
+
+    @override_settings(CONN_HEALTH_CHECKS=False)
+    def test_health_checks_can_be_disabled(self):
+        fake = FakeConnection(usable=False)
+        self.assertEquals(self.check(fake), {'checkouts': 1})
+        self.assertIsNotNone(fake.connection)
+
+
+class PersistentConnectionTests(TransactionTestCase):
+    def test_connection_is_reused_between_requests(self):
+        Board.objects.count()
+        connection_stats.reset()
+        request_started.send(sender=self.__class__)
+        Board.objects.count()
+        # Just used, it is not pinged
+        self.assertEquals(connection_stats.snapshot()['default'], {'checkouts': 1})
+
+    def test_idle_connection_is_pinged(self):
+        Board.objects.count()
+        connection_stats.reset()
+        with mock.patch('boards.connections.time.monotonic', return_value=time.monotonic() + 3600):
+            request_started.send(sender=self.__class__)
+        self.assertEquals(connection_stats.snapshot()['default'], {'checkouts': 1, 'health_checks': 1})
+
+    def test_reconnect_is_counted(self):
+        Board.objects.count()
+        connection_stats.reset()
+        # SQLite keeps in-memory test databases open, announce the new connection the way Django does
+        connection_created.send(sender=connection.__class__, connection=connection)
+        self.assertEquals(connection_stats.snapshot()['default'], {'reconnects': 1})
+
+
+class ConnectionStatsViewTests(TestCase):
+    def setUp(self):
+        self.url = reverse('connection_stats')
+
+    def test_staff_only(self):
+        User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.client.login(username='john', password='test12345')
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, 302)
+
+    def test_stats(self):
+        User.objects.create_superuser(username='admin', email='admin@mail.com', password='test12345')
+        self.client.login(username='admin', password='test12345')
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, 200)
+        stats = response.json()
+        self.assertIn('pid', stats)
+        self.assertTrue(stats['health_checks'])
+        self.assertIn('default', stats['conn_max_age'])
@@ -0,0 +1,130 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..counters import view_counter
+from ..models import Board, Post, Topic
+
+
+class FeedTestCase(TestCase):
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        cache.clear()
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        self.post = Post.objects.create(message='Hello **there**', topic=self.topic, created_by=self.user)
+
+    def reply(self, message='A reply'):
+        return Post.objects.create(message=message, topic=self.topic, created_by=self.user)
+
+
+class BoardFeedTests(FeedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('boards:board_feed', kwargs={'pk': self.board.pk})
+
+    def test_feed(self):
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('application/atom+xml'))
+        self.assertContains(response, '<title>Hello, world</title>')
+        topic_url = reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.assertContains(response, topic_url)
+
+    def test_not_found(self):
+        response = self.client.get(reverse('boards:board_feed', kwargs={'pk': 99}))
+        self.assertEquals(response.status_code, 404)
+
+    def test_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 304)
+
+    def test_cached_until_next_write(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        Topic.objects.create(subject='Another topic', board=self.board, starter=self.user)
+        self.assertContains(self.client.get(self.url), 'Another topic')
+
+    def test_edited_subject(self):
+        etag = self.client.get(self.url)['ETag']
+        self.topic.subject = 'Edited subject'
+        self.topic.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, '<title>Edited subject</title>')
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'forged.example'])
+    def test_links_follow_the_request_host_and_scheme(self):
+        self.assertContains(self.client.get(self.url, HTTP_HOST='forged.example'), 'http://forged.example/')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'http://testserver/')
+        self.assertNotContains(response, 'forged.example')
+        self.assertContains(self.client.get(self.url, secure=True), 'https://testserver/')
+
+    def test_same_for_every_user(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.login(username='john', password='test12345')
+        self.assertEquals(self.client.get(self.url)['ETag'], etag)
+
+    def test_link_from_board_page(self):
+        response = self.client.get(reverse('boards:board_topics', kwargs={'pk': self.board.pk}))
+        self.assertContains(response, 'type="application/atom+xml"')
+        self.assertContains(response, 'href="{}"'.format(self.url))
+
+
+class TopicFeedTests(FeedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('boards:topic_feed', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+
+    def test_feed(self):
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, 200)
+        self.assertContains(response, '&lt;strong&gt;there&lt;/strong&gt;')
+
+    def test_last_ten_posts_link_to_their_page(self):
+        for i in range(24):
+            self.reply('Reply {}'.format(i))
+        response = self.client.get(self.url)
+        content = response.content.decode()
+        self.assertEquals(content.count('<entry>'), 10)
+        self.assertIn('Reply 23', content)
+        self.assertNotIn('Reply 13<', content)
+        last = Post.objects.latest('pk')
+        self.assertIn('?page=2#{}'.format(last.pk), content)
+        self.assertIn('?page=1#', content)
+
+    def test_cached_until_next_write(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        self.reply('Fresh reply')
+        self.assertContains(self.client.get(self.url), 'Fresh reply')
+
+    def test_edit_invalidates(self):
+        self.client.get(self.url)
+        self.post.message = 'Edited'
+        self.post.updated_at = timezone.now()
+        self.post.save()
+        self.assertContains(self.client.get(self.url), 'Edited')
+
+    def test_views_do_not_invalidate(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.get(reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk}))
+        view_counter.flush()
+        self.assertEquals(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_not_found(self):
+        url = reverse('boards:topic_feed', kwargs={'board_pk': self.board.pk, 'topic_pk': 99})
+        self.assertEquals(self.client.get(url).status_code, 404)
+
+    def test_link_from_topic_page(self):
+        response = self.client.get(
+            reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        )
+        self.assertContains(response, 'href="{}"'.format(self.url))
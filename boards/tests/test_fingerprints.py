@@ -0,0 +1,121 @@
+import json
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from ..fingerprints import QueryFingerprintMiddleware, fingerprint, fingerprint_stats
+from ..models import Board, QueryFingerprint
+
+
+class FingerprintTests(TestCase):
+    def test_parameters_and_literals_are_folded(self):
+        key, normalized = fingerprint('SELECT  "id" FROM "boards_topic"\n WHERE "board_id" = %s LIMIT 21')
+        self.assertEquals(normalized, 'SELECT "id" FROM "boards_topic" WHERE "board_id" = ? LIMIT ?')
+        self.assertEquals(key, fingerprint('SELECT "id" FROM "boards_topic" WHERE "board_id" = %s LIMIT 10')[0])
+        self.assertEquals(fingerprint("SELECT 'a' FROM t1")[1], 'SELECT ? FROM t1')
+
+    def test_lists_are_folded(self):
+        self.assertEquals(fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s)')[1], 'SELECT ? FROM t WHERE id IN (...)')
+        self.assertEquals(fingerprint('SELECT 1 FROM t WHERE id IN (%s)')[1], 'SELECT ? FROM t WHERE id IN (...)')
+        self.assertEquals(fingerprint('INSERT INTO t (a) VALUES (%s), (%s)')[1], 'INSERT INTO t (a) VALUES (...)')
+
+
+@override_settings(SQL_FINGERPRINTS=True, SQL_FINGERPRINT_REPEAT_THRESHOLD=3, SQL_FINGERPRINT_FLUSH_INTERVAL=3600)
+class QueryFingerprintMiddlewareTests(TestCase):
+    def setUp(self):
+        for i in range(5):
+            Board.objects.create(name='Board {}'.format(i), description='Board.')
+        fingerprint_stats.reset()
+        self.addCleanup(fingerprint_stats.reset)
+
+    def get(self, url, view):
+        request = RequestFactory().get(url)
+        request.resolver_match = resolve(url)
+        return QueryFingerprintMiddleware(view)(request)
+
+    def test_requests_are_counted_per_url_name(self):
+        self.client.get(reverse('boards:home'))
+        self.client.get(reverse('boards:home'))
+        fingerprint_stats.flush()
+        fingerprints = QueryFingerprint.objects.filter(view_name='boards:home')
+        self.assertTrue(fingerprints.exists())
+        boards = fingerprints.get(sql__contains='FROM "boards_board"')
+        self.assertEquals(boards.executions, 2)
+        self.assertEquals(boards.requests, 2)
+        self.assertEquals(boards.repeated_requests, 0)
+        self.assertEquals(boards.max_per_request, 1)
+
+    def test_repeated_queries_are_flagged(self):
+        def view(request):
+            # One count per board, the N+1 pattern
+            return HttpResponse(str([board.topics.count() for board in Board.objects.all()]))
+
+        with self.assertLogs('boards.fingerprints', 'WARNING') as logs:
+            self.get(reverse('boards:home'), view)
+        self.assertEquals(len(logs.records), 1)
+        self.assertIn('N+1 query in boards:home, executed 5 times', logs.output[0])
+
+        self.get(reverse('boards:home'), lambda request: HttpResponse(Board.objects.first().topics.count()))
+        fingerprint_stats.flush()
+        count = QueryFingerprint.objects.get(view_name='boards:home', sql__contains='COUNT(*)')
+        self.assertEquals(count.executions, 6)
+        self.assertEquals(count.requests, 2)
+        self.assertEquals(count.repeated_requests, 1)
+        self.assertEquals(count.max_per_request, 5)
+
+    def test_flushes_add_up(self):
+        self.client.get(reverse('boards:home'))
+        fingerprint_stats.flush()
+        self.client.get(reverse('boards:home'))
+        fingerprint_stats.flush()
+        boards = QueryFingerprint.objects.get(view_name='boards:home', sql__contains='FROM "boards_board"')
+        self.assertEquals(boards.executions, 2)
+        self.assertEquals(boards.requests, 2)
+
+    @override_settings(SQL_FINGERPRINTS=False)
+    def test_disabled(self):
+        self.client.get(reverse('boards:home'))
+        fingerprint_stats.flush()
+        self.assertFalse(QueryFingerprint.objects.exists())
+
+
+@override_settings(SQL_FINGERPRINTS=True, SQL_FINGERPRINT_FLUSH_INTERVAL=3600)
+class QueryFingerprintReportTests(TestCase):
+    def setUp(self):
+        Board.objects.create(name='Django', description='Django board.')
+        fingerprint_stats.reset()
+        self.addCleanup(fingerprint_stats.reset)
+        self.client.get(reverse('boards:home'))
+        self.client.get(reverse('accounts:login'))
+        fingerprint_stats.flush()
+
+    def dump(self, *args):
+        out = StringIO()
+        call_command('dump_query_fingerprints', *args, stdout=out)
+        return json.loads(out.getvalue())
+
+    def test_dump(self):
+        rows = self.dump('--view', 'boards:home')
+        self.assertTrue(rows)
+        self.assertEquals({row['view_name'] for row in rows}, {'boards:home'})
+        self.assertEquals(rows[0]['executions_per_request'], 1)
+        self.assertEquals(self.dump('--repeated'), [])
+
+    def test_reset(self):
+        self.dump('--view', 'boards:home', '--reset')
+        self.assertFalse(QueryFingerprint.objects.filter(view_name='boards:home').exists())
+
+    def test_admin(self):
+        User.objects.create_superuser(username='admin', email='admin@mail.com', password='test12345')
+        self.client.login(username='admin', password='test12345')
+        response = self.client.get(reverse('admin:boards_queryfingerprint_changelist'))
+        self.assertContains(response, 'boards:home')
+        fingerprint = QueryFingerprint.objects.first()
+        response = self.client.get(reverse('admin:boards_queryfingerprint_change', args=(fingerprint.pk, )))
+        self.assertEquals(response.status_code, 200)
+        self.assertNotContains(response, 'name="executions"')
+        self.assertEquals(self.client.get(reverse('admin:boards_queryfingerprint_add')).status_code, 403)
@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..counters import view_counter
+from ..models import Board, Post, Topic
+
+
+class PostCardCacheTests(TestCase):
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topic = Topic.objects.create(subject='Hello, world', board=board, starter=self.user)
+        self.post = Post.objects.create(message='Original message', topic=self.topic, created_by=self.user)
+        self.url = reverse('boards:topic_posts', kwargs={'board_pk': board.pk, 'topic_pk': self.topic.pk})
+        self.edit_url = reverse('boards:edit_post', kwargs={
+            'board_pk': board.pk,
+            'topic_pk': self.topic.pk,
+            'post_pk': self.post.pk
+        })
+        caches['default'].clear()
+
+    def test_post_body_is_cached(self):
+        self.client.get(self.url)
+        Post.objects.filter(pk=self.post.pk).update(message_html='<p>Changed behind the cache</p>')
+        self.assertContains(self.client.get(self.url), 'Original message')
+
+    def test_edit_invalidates_post_body(self):
+        self.client.login(username='john', password='test12345')
+        self.client.get(self.url)
+        self.client.post(self.edit_url, {'message': 'Edited message'})
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Edited message')
+        self.assertNotContains(response, 'Original message')
+
+    def test_rename_invalidates_post_body(self):
+        self.client.get(self.url)
+        self.user.username = 'johnny'
+        self.user.save()
+        self.assertContains(self.client.get(self.url), '<strong class="text-muted">johnny</strong>')
+
+    def test_email_change_invalidates_avatar(self):
+        self.client.login(username='john', password='test12345')
+        self.client.get(self.url)
+        self.client.post(reverse('accounts:my_account'), {'email': 'john@doe.com'})
+        response = self.client.get(self.url)
+        self.assertContains(response, self.user.profile.email_hash, 0)
+        self.user.profile.refresh_from_db()
+        self.assertContains(response, self.user.profile.email_hash)
+
+    def test_edit_button_is_rendered_per_viewer(self):
+        self.client.get(self.url)
+        self.client.login(username='john', password='test12345')
+        self.assertContains(self.client.get(self.url), 'href="{}"'.format(self.edit_url))
+
+
+class FileCachePostCardTests(PostCardCacheTests):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        settings_override = override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': self.cache_dir,
+            }
+        })
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        super().setUp()
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'boards_test_cache',
+    }
+})
+class DatabaseCachePostCardTests(PostCardCacheTests):
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+        super().setUp()
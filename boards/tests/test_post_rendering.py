@@ -0,0 +1,111 @@
+import random
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .. import samples
+from ..models import Board, Post, Topic
+from ..rendering import RENDERERS, MistuneRenderer, get_renderer
+
+XSS_CORPUS = (
+    '<script>alert(1)</script>',
+    'hello <b onclick="alert(1)">bold</b> text',
+    '<div>\n<img src=x onerror=alert(1)>\n</div>',
+    '<a href="https://example.com">link</a>',
+    '[x](javascript:alert(1))',
+    '![i](javascript:alert(1))',
+    '<!-- <script>alert(1)</script> -->',
+    '`<script>` in code',
+    '    <script>in a code block</script>',
+)
+
+
+class PostRenderingTestCase(TestCase):
+    def setUp(self):
+        board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topic = Topic.objects.create(subject='Hello, world', board=board, starter=self.user)
+
+
+class StoredHtmlTests(PostRenderingTestCase):
+    def test_html_is_rendered_on_create(self):
+        post = Post.objects.create(message='**Hello**', topic=self.topic, created_by=self.user)
+        self.assertEquals(Post.objects.get(pk=post.pk).message_html, '<p><strong>Hello</strong></p>')
+
+    def test_html_is_rendered_on_partial_update(self):
+        post = Post.objects.create(message='Hello', topic=self.topic, created_by=self.user)
+        post.message = '*Bye*'
+        post.save(update_fields=['message'])
+        self.assertEquals(Post.objects.get(pk=post.pk).message_html, '<p><em>Bye</em></p>')
+
+    def test_stored_html_is_used(self):
+        post = Post.objects.create(message='Hello', topic=self.topic, created_by=self.user)
+        Post.objects.filter(pk=post.pk).update(message_html='<p>Stored</p>')
+        self.assertEquals(Post.objects.get(pk=post.pk).get_message_as_markdown(), '<p>Stored</p>')
+
+    def test_missing_html_is_rendered_on_the_fly(self):
+        post = Post.objects.create(message='Hello', topic=self.topic, created_by=self.user)
+        Post.objects.filter(pk=post.pk).update(message_html='')
+        self.assertEquals(Post.objects.get(pk=post.pk).get_message_as_markdown(), '<p>Hello</p>')
+
+
+class RenderPostsCommandTests(PostRenderingTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(5):
+            Post.objects.create(message='Post {}'.format(i), topic=self.topic, created_by=self.user)
+        Post.objects.update(message_html='')
+
+    def test_all_posts_are_rendered(self):
+        call_command('render_posts', chunk_size=2, stdout=StringIO())
+        self.assertFalse(Post.objects.filter(message_html='').exists())
+        post = Post.objects.order_by('pk').first()
+        self.assertEquals(post.message_html, '<p>Post 0</p>')
+
+    def test_missing_only(self):
+        Post.objects.filter(pk=Post.objects.order_by('pk').first().pk).update(message_html='<p>Kept</p>')
+        call_command('render_posts', missing=True, stdout=StringIO())
+        self.assertEquals(Post.objects.filter(message_html='<p>Kept</p>').count(), 1)
+        self.assertFalse(Post.objects.filter(message_html='').exists())
+
+
+class RendererTests(TestCase):
+    def test_xss_corpus_is_escaped(self):
+        for name in sorted(RENDERERS):
+            with self.subTest(renderer=name):
+                try:
+                    renderer = get_renderer(name)
+                except ImproperlyConfigured as e:
+                    # Reported as a skip of this renderer, not left out silently
+                    self.skipTest(str(e))
+                for text in XSS_CORPUS:
+                    with self.subTest(text=text):
+                        html = renderer.render(text)
+                        self.assertNotIn('<script', html)
+                        self.assertNotIn('<img src=x', html)
+                        self.assertNotIn('<b ', html)
+                        self.assertNotIn('<a href="https://example.com">', html)
+                        self.assertNotIn('javascript:', html)
+
+    def test_unsupported_mistune_version(self):
+        with mock.patch.dict('sys.modules', {'mistune': mock.Mock(__version__='2.0.4')}):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'requires mistune 0.8, found 2.0.4'):
+                MistuneRenderer()
+
+    def test_cached_markdown_has_the_same_output(self):
+        rng = random.Random(0)
+        corpus = list(XSS_CORPUS) + [samples.message(rng) for _ in range(20)]
+        for text in corpus:
+            self.assertEquals(get_renderer('markdown_cached').render(text), get_renderer('markdown').render(text))
+
+    def test_unknown_renderer(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_renderer('unknown')
+
+    @override_settings(MARKDOWN_RENDERER='markdown_cached')
+    def test_renderer_setting(self):
+        self.assertIs(get_renderer(), get_renderer('markdown_cached'))
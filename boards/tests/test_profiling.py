@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core import signing
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Board
+from ..profiling import SALT, issue_header_value
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def get_dumps(self):
+        return {
+            name: os.listdir(os.path.join(self.directory, name)) for name in os.listdir(self.directory)
+        }
+
+    def test_sampled_requests_are_profiled(self):
+        with self.settings(PROFILING_SAMPLE_RATE=1, PROFILING_DIRECTORY=self.directory):
+            response = self.client.get(reverse('boards:board_topics', kwargs={'pk': self.board.pk}))
+        self.assertEquals(response.status_code, 200)
+        dumps = self.get_dumps()
+        self.assertEquals(list(dumps), ['boards.board_topics'])
+        self.assertEquals(len(dumps['boards.board_topics']), 1)
+        self.assertTrue(dumps['boards.board_topics'][0].endswith('.prof'))
+
+    def test_unsampled_requests_are_not_profiled(self):
+        with self.settings(PROFILING_SAMPLE_RATE=0, PROFILING_DIRECTORY=self.directory):
+            self.client.get(reverse('boards:home'))
+        self.assertEquals(self.get_dumps(), {})
+
+    def test_signed_header(self):
+        with self.settings(PROFILING_SAMPLE_RATE=0, PROFILING_DIRECTORY=self.directory):
+            self.client.get(reverse('boards:home'), HTTP_X_PROFILE=issue_header_value())
+        self.assertEquals(list(self.get_dumps()), ['boards.home'])
+
+    def test_forged_or_expired_header(self):
+        forged = signing.TimestampSigner(key='not the secret key', salt=SALT).sign('profile')
+        with self.settings(PROFILING_SAMPLE_RATE=0, PROFILING_DIRECTORY=self.directory):
+            self.client.get(reverse('boards:home'), HTTP_X_PROFILE=forged)
+            self.client.get(reverse('boards:home'), HTTP_X_PROFILE='profile')
+            with self.settings(PROFILING_HEADER_MAX_AGE=-1):
+                self.client.get(reverse('boards:home'), HTTP_X_PROFILE=issue_header_value())
+        self.assertEquals(self.get_dumps(), {})
+
+
+class ProfileReportCommandTests(TestCase):
+    def setUp(self):
+        board = Board.objects.create(name='Django', description='Django board.')
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        with override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_DIRECTORY=self.directory):
+            self.client.get(reverse('boards:home'))
+            self.client.get(reverse('boards:board_topics', kwargs={'pk': board.pk}))
+            self.client.get(reverse('boards:board_topics', kwargs={'pk': board.pk}))
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('profile_report', '--directory', self.directory, *args, stdout=out)
+        return out.getvalue()
+
+    def test_merges_profiles_per_url_name(self):
+        output = self.call('--top', '5')
+        self.assertIn('boards:home: 1 requests', output)
+        self.assertIn('boards:board_topics: 2 requests', output)
+        for category in ('markdown', 'templates', 'database', 'orm', 'other'):
+            self.assertIn('  {} '.format(category), output)
+        self.assertIn('cumulative', output)
+
+    def test_view_filter(self):
+        output = self.call('--view', 'boards:home')
+        self.assertIn('boards:home', output)
+        self.assertNotIn('boards:board_topics', output)
+
+    def test_issue_header(self):
+        out = StringIO()
+        call_command('profile_report', '--issue-header', stdout=out)
+        value = out.getvalue().strip()
+        self.assertEquals(signing.TimestampSigner(salt=SALT).unsign(value), 'profile')
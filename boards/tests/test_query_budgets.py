@@ -0,0 +1,81 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from .utils import query_budget
+from ..counters import view_counter
+from ..models import Board, Post, Topic
+from ..throttling import memory_buckets
+
+
+class QueryBudgetTestCase(TestCase):
+    """
+        Every view gets a fixed query budget that has to hold with 1 and with 20 rows on the page.
+    """
+
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        memory_buckets.reset()
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.client.login(username='john', password='test12345')
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        self.post = Post.objects.create(message='Hello', topic=self.topic, created_by=self.user)
+
+    def create_boards(self, count):
+        for i in range(Board.objects.count(), count):
+            board = Board.objects.create(name='Board {}'.format(i), description='Board.')
+            topic = Topic.objects.create(subject='Topic', board=board, starter=self.create_user())
+            Post.objects.create(message='Hello', topic=topic, created_by=topic.starter)
+
+    def create_topics(self, count):
+        for i in range(self.board.topics.count(), count):
+            topic = Topic.objects.create(subject='Topic {}'.format(i), board=self.board, starter=self.create_user())
+            Post.objects.create(message='Hello', topic=topic, created_by=topic.starter)
+
+    def create_posts(self, count):
+        for i in range(self.topic.posts.count(), count):
+            Post.objects.create(message='Hello', topic=self.topic, created_by=self.create_user())
+
+    def create_user(self):
+        username = 'user{}'.format(User.objects.count())
+        return User.objects.create_user(username=username, email='{}@mail.com'.format(username))
+
+    def assertQueryBudget(self, budget, url, create_rows):
+        # The first request creates the session, every later one reads it
+        self.client.get(url)
+        for rows in (1, 20):
+            create_rows(rows)
+            with query_budget(budget):
+                response = self.client.get(url)
+            self.assertEquals(response.status_code, 200)
+
+
+class BoardsQueryBudgetTests(QueryBudgetTestCase):
+    def test_home(self):
+        self.assertQueryBudget(3, reverse('boards:home'), self.create_boards)
+
+    def test_board_topics(self):
+        url = reverse('boards:board_topics', kwargs={'pk': self.board.pk})
+        self.assertQueryBudget(5, url, self.create_topics)
+
+    def test_new_topic(self):
+        url = reverse('boards:new_topic', kwargs={'pk': self.board.pk})
+        self.assertQueryBudget(3, url, self.create_topics)
+
+    def test_topic_posts(self):
+        url = reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.assertQueryBudget(5, url, self.create_posts)
+
+    def test_reply_topic(self):
+        url = reverse('boards:reply_topic', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.assertQueryBudget(4, url, self.create_posts)
+
+    def test_edit_post(self):
+        url = reverse('boards:edit_post', kwargs={
+            'board_pk': self.board.pk,
+            'topic_pk': self.topic.pk,
+            'post_pk': self.post.pk
+        })
+        self.assertQueryBudget(3, url, self.create_posts)
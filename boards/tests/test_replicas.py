@@ -0,0 +1,117 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..counters import view_counter
+from ..models import Board, Post, Topic
+from ..replicas import PIN_COOKIE, ReplicaRouter, replica_reads
+from ..throttling import memory_buckets
+
+REPLICA = 'replica_test'
+
+
+@override_settings(REPLICA_DATABASES=[REPLICA], REPLICA_PIN_SECONDS=30)
+class ReplicaRoutingTests(TestCase):
+    """
+        A second in-memory SQLite database plays the replica. It has the same schema but only the rows
+        written to it directly, so every page shows which database it was read from.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        connections.databases[REPLICA] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+        connections.ensure_defaults(REPLICA)
+        connections.prepare_test_settings(REPLICA)
+        call_command('migrate', database=REPLICA, verbosity=0, interactive=False)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.databases[REPLICA]
+
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        memory_buckets.reset()
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.board = Board.objects.create(name='Primary board', description='Django board.')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        Post.objects.create(message='Hello', topic=self.topic, created_by=self.user)
+        Board.objects.using(REPLICA).all().delete()
+        Board.objects.using(REPLICA).create(pk=self.board.pk, name='Replica board', description='Lagging.')
+        self.client.login(username='john', password='test12345')
+        self.topic_url = reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+
+    def reply(self, message='A reply'):
+        url = reverse('boards:reply_topic', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        return self.client.post(url, {'message': message})
+
+    def test_home_reads_from_replica(self):
+        response = self.client.get(reverse('boards:home'))
+        self.assertContains(response, 'Replica board')
+        self.assertNotContains(response, 'Primary board')
+
+    def test_board_topics_reads_from_replica(self):
+        response = self.client.get(reverse('boards:board_topics', kwargs={'pk': self.board.pk}))
+        self.assertContains(response, 'Replica board')
+        self.assertNotContains(response, 'Hello, world')
+
+    def test_topic_posts_reads_from_replica(self):
+        # The topic has not reached the replica yet
+        self.assertEquals(self.client.get(self.topic_url).status_code, 404)
+
+    def test_users_are_read_from_primary(self):
+        response = self.client.get(reverse('boards:home'))
+        self.assertContains(response, 'john')
+
+    def test_reply_pins_to_primary(self):
+        response = self.reply()
+        self.assertEquals(response.cookies[PIN_COOKIE]['max-age'], 30)
+        response = self.client.get(self.topic_url)
+        self.assertContains(response, 'A reply')
+        self.assertContains(self.client.get(reverse('boards:home')), 'Primary board')
+
+    def test_new_topic_pins_to_primary(self):
+        url = reverse('boards:new_topic', kwargs={'pk': self.board.pk})
+        self.client.post(url, {'subject': 'Fresh topic', 'message': 'Message'})
+        response = self.client.get(reverse('boards:board_topics', kwargs={'pk': self.board.pk}))
+        self.assertContains(response, 'Fresh topic')
+
+    def test_edit_pins_to_primary(self):
+        post = self.topic.posts.get()
+        url = reverse('boards:edit_post', kwargs={
+            'board_pk': self.board.pk,
+            'topic_pk': self.topic.pk,
+            'post_pk': post.pk
+        })
+        self.client.post(url, {'message': 'Edited'})
+        self.assertContains(self.client.get(self.topic_url), 'Edited')
+
+    def test_invalid_post_does_not_pin(self):
+        response = self.reply(message='')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_pin_expiry(self):
+        self.reply()
+        self.client.cookies.pop(PIN_COOKIE)
+        self.assertEquals(self.client.get(self.topic_url).status_code, 404)
+
+    def test_writes_go_to_primary(self):
+        router = ReplicaRouter()
+        with replica_reads():
+            self.assertEquals(router.db_for_read(Topic), REPLICA)
+            self.assertEquals(router.db_for_write(Topic), 'default')
+            self.assertIsNone(router.db_for_read(User))
+        self.assertIsNone(router.db_for_read(Topic))
+
+
+@override_settings(REPLICA_DATABASES=[])
+class NoReplicaTests(TestCase):
+    def test_primary_only(self):
+        with replica_reads():
+            self.assertIsNone(ReplicaRouter().db_for_read(Topic))
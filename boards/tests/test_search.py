@@ -0,0 +1,125 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import resolve, reverse
+
+from ..counters import view_counter
+from ..models import Board, Post, Topic
+from ..search import SearchResults, get_backend
+from ..views import SearchView
+
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topic = Topic.objects.create(subject='Deploying with gunicorn', board=self.board, starter=self.user)
+        self.first_post = Post.objects.create(message='How do I run it?', topic=self.topic, created_by=self.user)
+        self.reply = Post.objects.create(message='Use nginx in front of it', topic=self.topic, created_by=self.user)
+
+    def search(self, query):
+        return list(SearchResults(query)[:20])
+
+
+class SearchResultsTests(SearchTestCase):
+    def test_backend(self):
+        self.assertTrue(get_backend().indexed)
+
+    def test_message(self):
+        self.assertEquals(self.search('nginx'), [self.reply])
+
+    def test_subject_only_matches_the_first_post(self):
+        self.assertEquals(self.search('gunicorn'), [self.first_post])
+
+    def test_all_terms_must_match(self):
+        self.assertEquals(self.search('nginx front'), [self.reply])
+        self.assertEquals(self.search('nginx apache'), [])
+
+    def test_stemming(self):
+        self.assertEquals(self.search('deploy'), [self.first_post])
+
+    def test_subject_ranks_first(self):
+        post = Post.objects.create(message='Gunicorn workers', topic=self.topic, created_by=self.user)
+        self.assertEquals(self.search('gunicorn'), [self.first_post, post])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEquals(self.search('nginx* "front^'), [self.reply])
+
+    def test_empty_query(self):
+        results = SearchResults('  ')
+        self.assertEquals(results.count(), 0)
+        self.assertEquals(list(results[:20]), [])
+
+    def test_edit(self):
+        self.reply.message = 'Use apache'
+        self.reply.save()
+        self.assertEquals(self.search('nginx'), [])
+        self.assertEquals(self.search('apache'), [self.reply])
+
+    def test_delete(self):
+        self.reply.delete()
+        self.assertEquals(self.search('nginx'), [])
+
+    def test_first_post_delete(self):
+        self.first_post.delete()
+        self.assertEquals(self.search('gunicorn'), [self.reply])
+
+    def test_topic_delete(self):
+        self.topic.delete()
+        self.assertEquals(self.search('gunicorn'), [])
+
+    def test_subject_change(self):
+        self.topic.subject = 'Deploying with uwsgi'
+        self.topic.save()
+        self.assertEquals(self.search('gunicorn'), [])
+        self.assertEquals(self.search('uwsgi'), [self.first_post])
+
+    def test_rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM boards_post_search')
+        self.assertEquals(self.search('nginx'), [])
+        out = StringIO()
+        call_command('rebuild_search_index', chunk_size=1, stdout=out)
+        self.assertIn('Indexed 2 posts', out.getvalue())
+        self.assertEquals(self.search('nginx'), [self.reply])
+        self.assertEquals(self.search('gunicorn'), [self.first_post])
+
+
+class SearchViewTests(SearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('boards:search')
+
+    def test_view_function(self):
+        view = resolve('/search/')
+        self.assertEquals(view.func.view_class, SearchView)
+
+    def test_status_code(self):
+        response = self.client.get(self.url)
+        self.assertEquals(response.status_code, 200)
+
+    def test_results(self):
+        response = self.client.get(self.url, {'q': 'nginx'})
+        self.assertEquals(list(response.context['posts']), [self.reply])
+        topic_url = reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.assertContains(response, 'href="{0}"'.format(topic_url))
+
+    def test_pagination_keeps_query(self):
+        for i in range(25):
+            Post.objects.create(message='nginx {}'.format(i), topic=self.topic, created_by=self.user)
+        response = self.client.get(self.url, {'q': 'nginx'})
+        self.assertEquals(response.context['paginator'].count, 26)
+        self.assertEquals(len(response.context['posts']), 20)
+        self.assertContains(response, 'href="?q=nginx&amp;page=2"')
+        response = self.client.get(self.url, {'q': 'nginx', 'page': 2})
+        self.assertEquals(len(response.context['posts']), 6)
+
+    def test_query_budget(self):
+        # Count, ranked ids and the posts with their topics, boards and authors
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {'q': 'nginx'})
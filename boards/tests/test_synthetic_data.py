@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..counters import view_counter
+from ..models import Board, Post, Topic
+
+
+class SeedForumTests(TestCase):
+    def setUp(self):
+        call_command('seed_forum', boards=3, topics=8, users=5, max_posts=30, batch_size=10, stdout=StringIO())
+
+    def test_zipf_topics_per_board(self):
+        counts = list(Board.objects.order_by('pk').values_list('topics_count', flat=True))
+        self.assertEquals(counts, [8, 4, 2])
+
+    def test_statistics(self):
+        for topic in Topic.objects.all():
+            self.assertEquals(topic.posts_count, topic.posts.count())
+            self.assertGreaterEqual(topic.posts_count, 1)
+        self.assertEquals(sum(Board.objects.values_list('posts_count', flat=True)), Post.objects.count())
+
+    def test_posts_are_rendered(self):
+        self.assertFalse(Post.objects.filter(message_html='').exists())
+
+    def test_posts_follow_topic_order(self):
+        for topic in Topic.objects.all():
+            last_post = topic.posts.order_by('-created_at').first()
+            self.assertEquals(topic.last_updated, last_post.created_at)
+
+    def test_new_rows_after_seeding(self):
+        call_command('seed_forum', boards=1, topics=2, users=5, stdout=StringIO())
+        self.assertEquals(Board.objects.count(), 4)
+        board = Board.objects.get(name='Seed board 4')
+        self.assertEquals(board.topics.count(), 2)
+
+
+class BenchmarkViewsTests(TestCase):
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+
+    def test_report(self):
+        call_command('seed_forum', boards=2, topics=15, users=3, stdout=StringIO())
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'report.json')
+        out = StringIO()
+        call_command('benchmark_views', repeat=2, output=path, stdout=out)
+        call_command('benchmark_views', repeat=1, compare=path, stdout=out)
+        self.assertIn('vs previous', out.getvalue())
+
+        with open(path) as report:
+            views = json.load(report)['views']
+        for label in ('home', 'board_topics', 'board_topics?page=2', 'new_topic', 'topic_posts', 'reply_topic',
+                      'edit_post', 'search?q=django+query'):
+            self.assertEquals(views[label]['status'], 200, label)
+            self.assertGreater(views[label]['queries'], 0)
+            self.assertLessEqual(views[label]['p50_ms'], views[label]['p99_ms'])
+
+    def test_topic_without_posts(self):
+        board = Board.objects.create(name='Django', description='Django board.')
+        user = User.objects.create_user(username='john', email='john@doe.com')
+        Topic.objects.create(subject='Hello, world', board=board, starter=user)
+        out = StringIO()
+        call_command('benchmark_views', repeat=1, stdout=out)
+        self.assertIn('topic_posts', out.getvalue())
+        self.assertNotIn('edit_post', out.getvalue())
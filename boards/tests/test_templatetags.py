@@ -1,7 +1,12 @@
+import hashlib
+
 from django import forms
+from django.contrib.auth.models import User
 from django.test import TestCase
 
+from accounts.models import Profile
 from ..templatetags.form_tags import field_type, input_class
+from ..templatetags.gravatar import gravatar
 
 
 class ExampleForm(forms.Form):
@@ -40,4 +45,20 @@ class InputClassTests(TestCase):
         }
         form = ExampleForm(data=data)
         self.assertEquals(input_class(form['name']), 'form-control is-invalid')
-        self.assertEquals(input_class(form['password']), 'form-control ')
\ No newline at end of file
+        self.assertEquals(input_class(form['password']), 'form-control ')
+
+
+class GravatarTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='john', email='John@Mail.com', password='test123')
+        self.url = 'https://www.gravatar.com/avatar/{}?d=mm&s=256'.format(hashlib.md5(b'john@mail.com').hexdigest())
+
+    def test_stored_email_hash(self):
+        user = User.objects.select_related('profile').get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEquals(gravatar(user), self.url)
+
+    def test_user_without_profile(self):
+        Profile.objects.all().delete()
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEquals(gravatar(user), self.url)
@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Board, Post, Topic
+from ..throttling import CacheBuckets, MemoryBuckets, memory_buckets, parse_rate
+
+RATES = {
+    'new_topic': {'ip': '', 'user': '2/m'},
+    'reply_topic': {'ip': '3/m', 'user': '2/m'},
+}
+
+
+class TokenBucketTests(TestCase):
+    def test_parse_rate(self):
+        self.assertEquals(parse_rate('5/m'), (5, 5 / 60))
+        self.assertEquals(parse_rate('10/20'), (10, 0.5))
+        self.assertIsNone(parse_rate(''))
+
+    def assertBucket(self, buckets, clock):
+        clock.return_value = 100
+        self.assertEquals([buckets.take('key', 2, 0.5) for _ in range(3)], [0, 0, 2])
+        self.assertEquals(buckets.take('other', 2, 0.5), 0)
+        clock.return_value = 101
+        self.assertEquals(buckets.take('key', 2, 0.5), 1)
+        clock.return_value = 102
+        self.assertEquals(buckets.take('key', 2, 0.5), 0)
+        clock.return_value = 1000
+        self.assertEquals([buckets.take('key', 2, 0.5) for _ in range(3)], [0, 0, 2])
+
+    def test_memory_buckets(self):
+        with mock.patch('boards.throttling.time.monotonic') as clock:
+            self.assertBucket(MemoryBuckets(), clock)
+
+    def test_cache_buckets(self):
+        cache.clear()
+        with mock.patch('boards.throttling.time.time') as clock:
+            self.assertBucket(CacheBuckets(cache), clock)
+
+    def test_least_recently_used_buckets_are_dropped(self):
+        buckets = MemoryBuckets(max_keys=2)
+        with mock.patch('boards.throttling.time.monotonic') as clock:
+            clock.return_value = 100
+            buckets.take('a', 2, 1)
+            buckets.take('b', 2, 1)
+            buckets.take('a', 2, 1)
+            buckets.take('c', 2, 1)
+        self.assertEquals(list(buckets._buckets), ['a', 'c'])
+
+
+@override_settings(THROTTLE_RATES=RATES, THROTTLE_CACHE='')
+class ThrottledViewsTests(TestCase):
+    def setUp(self):
+        memory_buckets.reset()
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topic = Topic.objects.create(subject='Hello, world', board=self.board, starter=self.user)
+        Post.objects.create(message='Hello', topic=self.topic, created_by=self.user)
+        self.client.login(username='john', password='test12345')
+        self.reply_url = reverse('boards:reply_topic', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.new_topic_url = reverse('boards:new_topic', kwargs={'pk': self.board.pk})
+
+    def reply(self, client=None, ip='10.0.0.1'):
+        return (client or self.client).post(self.reply_url, {'message': 'Reply'}, REMOTE_ADDR=ip)
+
+    def test_user_limit(self):
+        self.assertEquals([self.reply().status_code for _ in range(3)], [302, 302, 429])
+        self.assertEquals(self.topic.posts.count(), 3)
+        # Topics have their own buckets
+        response = self.client.post(self.new_topic_url, {'subject': 'New', 'message': 'Message'})
+        self.assertEquals(response.status_code, 302)
+
+    def test_ip_limit_runs_no_queries(self):
+        for i in range(3):
+            user = User.objects.create_user(username='user{}'.format(i), password='test12345')
+            client = self.client_class()
+            client.login(username=user.username, password='test12345')
+            self.assertEquals(self.reply(client).status_code, 302)
+        with self.assertNumQueries(0):
+            response = self.reply()
+        self.assertEquals(response.status_code, 429)
+        self.assertEquals(response['Retry-After'], '20')
+        # Another address still gets through
+        self.assertEquals(self.reply(ip='10.0.0.2').status_code, 302)
+
+    @override_settings(THROTTLE_RATES={'reply_topic': {'ip': '3/m'}}, THROTTLE_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_ip_behind_a_proxy(self):
+        def reply(forwarded_for):
+            return self.client.post(self.reply_url, {'message': 'Reply'}, HTTP_X_FORWARDED_FOR=forwarded_for)
+
+        # The addresses sent by the client are not trusted, the one added by the proxy is
+        self.assertEquals([reply('{}, 10.0.0.1'.format(i)).status_code for i in range(4)], [302, 302, 302, 429])
+        self.assertEquals(reply('10.0.0.2').status_code, 302)
+
+    @override_settings(THROTTLE_RATES={'reply_topic': {'ip': '3/m'}}, THROTTLE_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_ip_without_the_proxy_header(self):
+        statuses = [self.client.post(self.reply_url, {'message': 'Reply'}).status_code for _ in range(4)]
+        self.assertEquals(statuses, [302, 302, 302, 429])
+        response = self.client.post(self.reply_url, {'message': 'Reply'}, HTTP_X_FORWARDED_FOR=' ')
+        self.assertEquals(response.status_code, 429)
+
+    def test_get_is_not_throttled(self):
+        for _ in range(3):
+            self.reply()
+        self.assertEquals(self.client.get(self.reply_url).status_code, 200)
+
+    @override_settings(THROTTLE_CACHE='default')
+    def test_shared_cache(self):
+        cache.clear()
+        self.assertEquals([self.reply().status_code for _ in range(3)], [302, 302, 429])
+        self.assertFalse(memory_buckets._buckets)
+        self.assertIsNotNone(cache.get('throttle:reply_topic:user:{}'.format(self.user.pk)))
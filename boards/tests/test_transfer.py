@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Board, Post, Topic
+from ..search import SearchResults
+
+
+class ForumTransferTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        self.topic = Topic.objects.create(subject='Deploying', board=self.board, starter=self.user, views=7)
+        self.posts = [
+            Post.objects.create(message='Message {}'.format(i), topic=self.topic, created_by=self.user)
+            for i in range(5)
+        ]
+        self.created_at = datetime(2017, 10, 1, 12, 30, tzinfo=timezone.utc)
+        Post.objects.filter(pk=self.posts[0].pk).update(created_at=self.created_at)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def round_trip(self, name, batch_size=2):
+        path = os.path.join(self.directory, name)
+        out = StringIO()
+        call_command('export_forum', path, stdout=out)
+        self.assertIn('Exported 7 rows', out.getvalue())
+        Board.objects.all().delete()
+        call_command('import_forum', path, batch_size=batch_size, stdout=out)
+        self.assertIn('Imported 7 rows', out.getvalue())
+
+    def test_round_trip(self):
+        self.round_trip('forum.jsonl')
+        board = Board.objects.get(pk=self.board.pk)
+        topic = Topic.objects.get(pk=self.topic.pk)
+        self.assertEquals(board.name, 'Django')
+        self.assertEquals(topic.views, 7)
+        self.assertEquals(
+            list(topic.posts.order_by('pk').values_list('pk', 'message')),
+            [(post.pk, post.message) for post in self.posts]
+        )
+
+    def test_gzip(self):
+        self.round_trip('forum.jsonl.gz')
+        self.assertEquals(Post.objects.count(), 5)
+
+    def test_timestamps_are_kept(self):
+        self.round_trip('forum.jsonl')
+        self.assertEquals(Post.objects.get(pk=self.posts[0].pk).created_at, self.created_at)
+        self.assertEquals(Topic.objects.get(pk=self.topic.pk).last_updated, self.posts[-1].created_at)
+        self.assertTrue(Post._meta.get_field('created_at').auto_now_add)
+
+    def test_statistics_and_search_are_rebuilt(self):
+        self.round_trip('forum.jsonl')
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertEquals((board.topics_count, board.posts_count), (1, 5))
+        self.assertEquals(Topic.objects.get(pk=self.topic.pk).posts_count, 5)
+        self.assertEquals(SearchResults('deploying').count(), 1)
+
+    def test_rendered_on_first_view(self):
+        self.round_trip('forum.jsonl')
+        post = Post.objects.get(pk=self.posts[1].pk)
+        self.assertEquals(post.message_html, '')
+        self.assertEquals(post.get_message_as_markdown(), '<p>Message 1</p>')
+
+    def test_invalid_record(self):
+        path = os.path.join(self.directory, 'forum.jsonl')
+        with open(path, 'w') as dump:
+            dump.write('{"model": "user", "fields": {}}\n')
+        with self.assertRaisesMessage(Exception, 'Line 1: invalid record'):
+            call_command('import_forum', path, stdout=StringIO())
@@ -1,6 +1,9 @@
+from unittest import mock
+
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
 from django.urls import resolve
+from django.db import DatabaseError
 from django.test import TestCase
 from django.contrib.auth import login
 
@@ -8,6 +11,7 @@ from .utils import create_response
 from ..views import BoardListView, TopicListView, new_topic
 from ..models import Board, Topic, Post
 from ..forms import NewTopicForm
+from ..throttling import memory_buckets
 
 
 class HomeTests(TestCase):
@@ -52,6 +56,7 @@ class BoardTopicsTests(TestCase):
 
 class NewTopicTests(TestCase):
     def setUp(self):
+        memory_buckets.reset()
         self.board = Board.objects.create(name='Django', description='Dajngo Board.')
         self.user = User.objects.create_user(username='john', email='john@mail.com', password='test123')
         self.client.login(username='john', password='test123')
@@ -85,6 +90,18 @@ class NewTopicTests(TestCase):
         self.assertTrue(Topic.objects.exists())
         self.assertTrue(Post.objects.exists())
 
+    def test_new_topic_is_atomic(self):
+        """
+            A topic must not be left without its first post when creating the post fails
+        """
+        data = {'subject': 'Test',
+                'message': 'Test message.'}
+        with mock.patch('boards.views.Post.objects.create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                create_response(client=self.client.post, url='boards:new_topic', data=data, pk=self.board.pk)
+        self.assertFalse(Topic.objects.exists())
+        self.assertEquals(Board.objects.get(pk=self.board.pk).topics_count, 0)
+
     def test_new_topic_invalid_post_data(self):
         """
             Invalid post data should not redirect
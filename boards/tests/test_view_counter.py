@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+from collections import Counter
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..counters import ViewCounter, ViewedTopics, view_counter
+from ..models import Board, Topic
+from .runner import TestRunner
+
+
+class ViewCounterTestCase(TestCase):
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        board = Board.objects.create(name='Django', description='Django board.')
+        user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topic = Topic.objects.create(subject='Hello, world', board=board, starter=user)
+        self.other_topic = Topic.objects.create(subject='Other', board=board, starter=user)
+
+    def assertViews(self, topic, views):
+        topic.refresh_from_db()
+        self.assertEquals(topic.views, views)
+
+
+@override_settings(VIEW_COUNTER_MAX_PENDING=3, VIEW_COUNTER_FLUSH_INTERVAL=3600)
+class ViewCounterTests(ViewCounterTestCase):
+    def setUp(self):
+        super().setUp()
+        self.counter = ViewCounter()
+        self.addCleanup(self.counter.reset)
+
+    def test_hits_are_buffered(self):
+        self.counter.hit(self.topic.pk)
+        self.counter.hit(self.topic.pk)
+        self.assertViews(self.topic, 0)
+
+    def test_flush_after_max_pending_hits(self):
+        self.counter.hit(self.topic.pk)
+        self.counter.hit(self.other_topic.pk)
+        self.counter.hit(self.topic.pk)
+        self.assertViews(self.topic, 2)
+        self.assertViews(self.other_topic, 1)
+
+    @override_settings(VIEW_COUNTER_FLUSH_INTERVAL=0)
+    def test_flush_after_interval(self):
+        self.counter.hit(self.topic.pk)
+        self.assertViews(self.topic, 1)
+
+    def test_flush_does_not_overwrite_other_increments(self):
+        self.counter.hit(self.topic.pk)
+        Topic.objects.filter(pk=self.topic.pk).update(views=10)
+        self.counter.flush()
+        self.assertViews(self.topic, 11)
+
+
+class RecordingViewCounter(ViewCounter):
+    def __init__(self):
+        super().__init__()
+        self.written = Counter()
+        self.write_lock = threading.Lock()
+
+    def write(self, pending):
+        with self.write_lock:
+            self.written.update(pending)
+
+
+@override_settings(VIEW_COUNTER_MAX_PENDING=7, VIEW_COUNTER_FLUSH_INTERVAL=3600)
+class ConcurrentViewCounterTests(TestCase):
+    def test_no_hits_are_lost(self):
+        counter = RecordingViewCounter()
+
+        def view_topics():
+            for i in range(1000):
+                counter.hit(i % 5)
+
+        threads = [threading.Thread(target=view_topics) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.flush()
+
+        self.assertEquals(counter.written, Counter({topic_pk: 1600 for topic_pk in range(5)}))
+
+
+@override_settings(VIEW_COUNTER_MAX_PENDING=100, VIEW_COUNTER_FLUSH_INTERVAL=0.05)
+class TimedViewCounterTests(TestCase):
+    def test_idle_process_flushes_after_interval(self):
+        counter = RecordingViewCounter()
+        self.addCleanup(counter.reset)
+        counter.hit(1)
+        counter.hit(1)
+        self.assertEquals(counter.written, Counter())
+        for _ in range(100):
+            if counter.written:
+                break
+            time.sleep(0.01)
+        self.assertEquals(counter.written, Counter({1: 2}))
+
+    def test_reset_cancels_the_timer(self):
+        counter = RecordingViewCounter()
+        counter.hit(1)
+        counter.reset()
+        time.sleep(0.1)
+        self.assertEquals(counter.written, Counter())
+
+
+class TopicPostsViewCountTests(ViewCounterTestCase):
+    @override_settings(VIEW_COUNTER_MAX_PENDING=1)
+    def test_view_is_counted_once_per_session(self):
+        url = reverse('boards:topic_posts', kwargs={'board_pk': self.topic.board.pk, 'topic_pk': self.topic.pk})
+        self.client.get(url)
+        self.client.get(url)
+        view_counter.flush()
+        self.assertViews(self.topic, 1)
+
+
+class TestRunnerTests(ViewCounterTestCase):
+    @override_settings(VIEW_COUNTER_MAX_PENDING=100, VIEW_COUNTER_FLUSH_INTERVAL=3600)
+    def test_buffered_views_are_dropped_with_the_test_databases(self):
+        view_counter.hit(self.topic.pk)
+        with mock.patch('django.test.runner.DiscoverRunner.teardown_databases') as teardown_databases:
+            TestRunner().teardown_databases([])
+        teardown_databases.assert_called_once_with([])
+        view_counter.flush()
+        self.assertViews(self.topic, 0)
+
+
+@override_settings(VIEWED_TOPICS_BITS=1024, VIEWED_TOPICS_MAX_AGE=3600)
+class ViewedTopicsTests(TestCase):
+    def setUp(self):
+        self.session = {}
+
+    def test_topic_is_counted_once(self):
+        self.assertTrue(ViewedTopics(self.session).add(1))
+        self.assertFalse(ViewedTopics(self.session).add(1))
+        self.assertTrue(ViewedTopics(self.session).add(2))
+
+    def test_session_size_is_constant(self):
+        viewed = ViewedTopics(self.session)
+        viewed.add(1)
+        size = len(json.dumps(self.session))
+        for topic_pk in range(2, 5000):
+            viewed.add(topic_pk)
+        self.assertEquals(len(json.dumps(self.session)), size)
+        self.assertEquals(list(self.session), ['viewed_topics'])
+
+    def test_false_positives_are_rare(self):
+        viewed = ViewedTopics(self.session)
+        counted = sum(viewed.add(topic_pk) for topic_pk in range(5000))
+        self.assertGreater(counted, 5000 * 0.99)
+
+    def test_previous_generation_is_remembered(self):
+        ViewedTopics(self.session).add(1)
+        self.session['viewed_topics']['started'] -= 3600
+        self.assertFalse(ViewedTopics(self.session).add(1))
+        # Carried over to the new generation
+        self.session['viewed_topics']['started'] -= 3600
+        self.assertFalse(ViewedTopics(self.session).add(1))
+
+    def test_expiry(self):
+        ViewedTopics(self.session).add(1)
+        self.session['viewed_topics']['started'] -= 2 * 3600
+        self.assertTrue(ViewedTopics(self.session).add(1))
+
+    def test_full_generation_rotates(self):
+        viewed = ViewedTopics(self.session)
+        for topic_pk in range(viewed.capacity):
+            viewed.add(topic_pk)
+        viewed.add(10000)
+        state = self.session['viewed_topics']
+        self.assertEquals(state['count'], 1)
+        self.assertFalse(viewed.add(0))
+
+    def test_legacy_keys_are_purged(self):
+        self.session.update({'viewed_topic_1': True, 'viewed_topic_2': True, '_auth_user_id': '1'})
+        ViewedTopics(self.session).add(3)
+        self.assertEquals(sorted(self.session), ['_auth_user_id', 'viewed_topics'])
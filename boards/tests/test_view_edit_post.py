@@ -2,12 +2,15 @@ from django.contrib.auth.models import User
 from django.forms import ModelForm
 from django.test import TestCase
 from django.urls import reverse, resolve
+from ..counters import view_counter
 from ..models import Board, Post, Topic
 from ..views import PostUpdateView
 
 
 class PostUpdateViewTestCase(TestCase):
     def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
         self.board = Board.objects.create(name='Django', description='Django board.')
         self.username = 'john'
         self.password = '123'
@@ -78,6 +81,7 @@ class SuccessfulPostUpdateViewTests(PostUpdateViewTestCase):
     def test_post_changed(self):
         self.post.refresh_from_db()
         self.assertEquals(self.post.message, 'edited message')
+        self.assertEquals(self.post.message_html, '<p>edited message</p>')
 
 
 class InvalidPostUpdateViewTest(PostUpdateViewTestCase):
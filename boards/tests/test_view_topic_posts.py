@@ -2,12 +2,15 @@ from django.test import TestCase
 from django.urls import reverse, resolve
 from django.contrib.auth.models import User
 
+from ..counters import view_counter
 from ..models import Board, Topic, Post
 from ..views import PostListView
 
 
 class TopicPostsTests(TestCase):
     def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
         board = Board.objects.create(name='Board', description='Django Board.')
         user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
         topic = Topic.objects.create(subject='New Topic', board=board, starter=user)
@@ -20,4 +23,35 @@ class TopicPostsTests(TestCase):
 
     def test_topic_posts_url_resolves_correct_view(self):
         view = resolve('/boards/1/topics/1/')
-        self.assertEquals(view.func.view_class, PostListView)
\ No newline at end of file
+        self.assertEquals(view.func.view_class, PostListView)
+
+
+class TopicPostsAuthorsTests(TestCase):
+    def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        self.board = Board.objects.create(name='Board', description='Django Board.')
+        self.user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topic = Topic.objects.create(subject='New Topic', board=self.board, starter=self.user)
+        self.url = reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+
+    def create_posts(self, count):
+        for i in range(User.objects.count(), User.objects.count() + count):
+            author = User.objects.create_user(username='user{}'.format(i), email='user{}@mail.com'.format(i))
+            Post.objects.create(message='Hello World!', topic=self.topic, created_by=author)
+            Post.objects.create(message='Hello again!', topic=self.topic, created_by=author)
+
+    def test_author_posts_count(self):
+        self.create_posts(1)
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Posts: 2', 2)
+
+    def test_authors_are_loaded_with_the_posts(self):
+        self.create_posts(1)
+        # The first visit creates the session
+        self.client.get(self.url)
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+        self.create_posts(9)
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
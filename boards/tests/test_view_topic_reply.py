@@ -1,13 +1,20 @@
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, resolve
+from ..counters import view_counter
 from ..models import Board, Post, Topic
 from ..views import reply_topic
 from ..forms import PostReplyForm
+from ..throttling import memory_buckets
 
 
 class TopicReplyTestCase(TestCase):
     def setUp(self):
+        view_counter.reset()
+        self.addCleanup(view_counter.reset)
+        memory_buckets.reset()
         self.board = Board.objects.create(name='Board', description='Django Board.')
         self.username = 'john'
         self.password = 'test12345'
@@ -71,6 +78,10 @@ class SuccessfulTopicReplyTests(TopicReplyTestCase):
         topic_post_url = f'{url}?page=1#2'
         self.assertRedirects(self.response, topic_post_url)
 
+    def test_topic_last_updated(self):
+        post = Post.objects.latest('created_at')
+        self.assertEquals(Topic.objects.get(pk=self.topic.pk).last_updated, post.created_at)
+
     def test_reply_created(self):
         '''
         The total post count should be 2
@@ -80,6 +91,34 @@ class SuccessfulTopicReplyTests(TopicReplyTestCase):
         self.assertEquals(Post.objects.count(), 2)
 
 
+class TopicReplyWritesTests(TopicReplyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.login(username=self.username, password=self.password)
+        self.client.get(self.url)
+
+    def test_redirects_to_last_page(self):
+        user = User.objects.get(username=self.username)
+        for i in range(19):
+            Post.objects.create(message='test message', topic=self.topic, created_by=user)
+        response = self.client.post(self.url, {'message': 'hello, world!'})
+        post = Post.objects.latest('pk')
+        url = reverse('boards:topic_posts', kwargs={'board_pk': self.board.pk, 'topic_pk': self.topic.pk})
+        self.assertRedirects(response, f'{url}?page=2#{post.pk}')
+
+    def test_targeted_updates(self):
+        '''
+        The reply neither counts the posts nor rewrites the whole topic row
+        '''
+        with CaptureQueriesContext(connection) as context:
+            self.client.post(self.url, {'message': 'hello, world!'})
+        statements = [query['sql'] for query in context.captured_queries]
+        self.assertFalse([sql for sql in statements if 'COUNT(' in sql])
+        topic_updates = [sql for sql in statements if sql.startswith('UPDATE "boards_topic"')]
+        self.assertEquals(len(topic_updates), 1)
+        self.assertNotIn('"subject"', topic_updates[0])
+
+
 class InvalidTopicReplyTests(TopicReplyTestCase):
     def setUp(self):
         '''
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.template import engines
+from django.test import TestCase
+
+from ..warmup import compile_urls, get_template_names, load_templates, warm_up
+
+
+class WarmUpTests(TestCase):
+    def test_all_app_templates_are_loaded(self):
+        names = list(get_template_names('boards')) + list(get_template_names('accounts'))
+        self.assertIn('boards/includes/pagination.html', names)
+        self.assertIn('accounts/password_reset_subject.txt', names)
+        self.assertEquals(load_templates(), len(names))
+
+    def test_templates_are_cached(self):
+        load_templates()
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertEquals(loader.__class__.__name__, 'Loader')
+        self.assertIn('cached', loader.__module__)
+        cached = set(loader.get_template_cache)
+        self.assertIn('boards/home.html', cached)
+        self.assertIn('accounts/login.html', cached)
+
+    def test_url_patterns_are_compiled(self):
+        self.assertGreater(compile_urls(), 20)
+
+    def test_warm_up(self):
+        templates, urls = warm_up()
+        self.assertGreater(templates, 0)
+        self.assertGreater(urls, 0)
+
+
+class LazyImportTests(TestCase):
+    def test_markdown_is_imported_on_first_render(self):
+        script = (
+            'import sys, django; django.setup(); import boards.models, boards.views; '
+            'before = "markdown" in sys.modules; '
+            'from boards.rendering import render_markdown; render_markdown("*x*"); '
+            'print(before, "markdown" in sys.modules)'
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='myproject.settings', PYTHONPATH=settings.BASE_DIR)
+        output = subprocess.check_output([sys.executable, '-c', script], env=env)
+        self.assertEquals(output.decode().split(), ['False', 'True'])
@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Board, Topic
+
+
+class BoardTopicsTestCase(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name='Django', description='Django board.')
+        user = User.objects.create_user(username='john', email='john@mail.com', password='test12345')
+        self.topics = [
+            Topic.objects.create(subject='Topic {}'.format(i), board=self.board, starter=user) for i in range(25)
+        ]
+        # Newest first, the way the board lists them
+        self.topics.reverse()
+        self.url = reverse('boards:board_topics', kwargs={'pk': self.board.pk})
+
+
+class BoardTopicsPaginationTests(BoardTopicsTestCase):
+    def get_topics(self, response):
+        return list(response.context['topics'])
+
+    def test_first_page(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.context['keyset_paginated'])
+        self.assertEquals(self.get_topics(response), self.topics[:10])
+        self.assertContains(response, '~3 pages')
+
+    def test_next_and_previous_pages(self):
+        paginator = self.client.get(self.url).context['paginator']
+        response = self.client.get(self.url, {'after': paginator.encode_cursor(self.topics[9])})
+        self.assertEquals(self.get_topics(response), self.topics[10:20])
+
+        response = self.client.get(self.url, {'after': paginator.encode_cursor(self.topics[19])})
+        self.assertEquals(self.get_topics(response), self.topics[20:])
+        self.assertFalse(response.context['page_obj'].has_next())
+
+        response = self.client.get(self.url, {'before': paginator.encode_cursor(self.topics[20])})
+        self.assertEquals(self.get_topics(response), self.topics[10:20])
+        self.assertTrue(response.context['page_obj'].has_previous())
+
+    def test_previous_page_near_the_top_is_the_first_page(self):
+        paginator = self.client.get(self.url).context['paginator']
+        response = self.client.get(self.url, {'before': paginator.encode_cursor(self.topics[5])})
+        self.assertEquals(self.get_topics(response), self.topics[:10])
+        self.assertFalse(response.context['page_obj'].has_previous())
+
+    def test_next_link(self):
+        response = self.client.get(self.url)
+        cursor = response.context['page_obj'].next_cursor()
+        self.assertContains(response, 'href="?after={}"'.format(cursor))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'after': 'abc'})
+        self.assertEquals(response.status_code, 404)
+
+    def test_out_of_range_cursor(self):
+        for cursor in ('1-' + '9' * 30, '9' * 30 + '-1'):
+            response = self.client.get(self.url, {'before': cursor})
+            self.assertEquals(response.status_code, 404)
+
+    def test_page_urls_keep_working(self):
+        response = self.client.get(self.url, {'page': 3})
+        self.assertFalse(response.context['keyset_paginated'])
+        self.assertEquals(self.get_topics(response), self.topics[20:])
+        self.assertContains(response, 'href="?page=2"')
+
+
+class ExplainHotQueriesTests(BoardTopicsTestCase):
+    def test_query_plans_are_printed(self):
+        out = StringIO()
+        call_command('explain_hot_queries', board=self.board.pk, stdout=out)
+        self.assertIn('Board topics, keyset page', out.getvalue())
+        self.assertIn('topic_board_updated_idx', out.getvalue())
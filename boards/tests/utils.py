@@ -1,8 +1,36 @@
+from contextlib import ContextDecorator
+
 from django.core.urlresolvers import reverse
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
 
 
 def create_response(client, url, data=None, pk=None):
     url = reverse(url, kwargs={'pk': pk}) if pk else reverse(url)
     response = client(url, data) if data else client(url)
 
-    return response
\ No newline at end of file
+    return response
+
+
+class query_budget(ContextDecorator):
+    """
+        Fails with an `AssertionError` listing the executed queries when the block, or the decorated test,
+        runs more than `max_queries` queries. Unlike `assertNumQueries` it allows running fewer.
+    """
+
+    def __init__(self, max_queries, using=DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.using = using
+
+    def __enter__(self):
+        self.context = CaptureQueriesContext(connections[self.using])
+        return self.context.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None and len(self.context) > self.max_queries:
+            raise AssertionError('{} queries executed, the budget is {}\nCaptured queries were:\n{}'.format(
+                len(self.context),
+                self.max_queries,
+                '\n'.join(query['sql'] for query in self.context.captured_queries)
+            ))
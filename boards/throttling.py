@@ -0,0 +1,159 @@
+"""
+    Token buckets for the views that write.
+
+    `throttle('<view>')` gives every IP address, and every signed in user, a bucket per view holding up to
+    `<requests>` tokens of the `THROTTLE_RATES` rate `<requests>/<period>`, refilled evenly over the period.
+    A POST takes a token from each bucket, or gets a 429 response with a `Retry-After` header before the view
+    runs. The buckets are kept in memory by every process, or in the `THROTTLE_CACHE` cache to share them.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """
+        `'5/m'` or `'5/60'` is a bucket of 5 tokens refilled at 5 tokens a minute, returned as
+        `(5, tokens per second)`. An empty rate is no limit, `None`.
+    """
+    if not rate:
+        return None
+    count, period = rate.split('/')
+    seconds = PERIODS[period] if period in PERIODS else int(period)
+    return int(count), int(count) / seconds
+
+
+def refill(tokens, updated, capacity, rate, now):
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+class MemoryBuckets:
+    """
+        Buckets of this process, at most `max_keys` of them. Once there are more, the least recently used
+        is dropped, it starts over full if its key comes back.
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def take(self, key, capacity, rate):
+        """
+            Take a token, returns 0 when there was one or the seconds until there is one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            tokens = capacity if bucket is None else refill(bucket[0], bucket[1], capacity, rate, now)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBuckets:
+    """
+        Buckets shared through a cache. Reading and writing a bucket is not atomic, processes racing on the same
+        bucket can let a few more requests through, which does not matter against a flood.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def take(self, key, capacity, rate):
+        now = time.time()
+        bucket = self.cache.get(key)
+        tokens = capacity if bucket is None else refill(bucket[0], bucket[1], capacity, rate, now)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0
+        else:
+            wait = (1 - tokens) / rate
+        # Expires once refilled to capacity
+        self.cache.set(key, (tokens, now), math.ceil((capacity - tokens) / rate) + 1)
+        return wait
+
+
+memory_buckets = MemoryBuckets()
+
+
+def get_buckets():
+    if settings.THROTTLE_CACHE:
+        return CacheBuckets(caches[settings.THROTTLE_CACHE])
+    return memory_buckets
+
+
+def take(buckets, view_name, kind, identity, rate):
+    rate = parse_rate(rate)
+    if rate is None or identity is None:
+        return 0
+    return buckets.take('throttle:{}:{}:{}'.format(view_name, kind, identity), *rate)
+
+
+def get_client_ip(request):
+    """
+        `REMOTE_ADDR`, or behind a proxy the last address of its `THROTTLE_IP_HEADER`, the one it added.
+        The addresses before it are sent by the client and can be anything. A request without the header, which
+        did not come through the proxy, falls back to `REMOTE_ADDR` rather than going unlimited.
+    """
+    if settings.THROTTLE_IP_HEADER:
+        address = request.META.get(settings.THROTTLE_IP_HEADER, '').split(',')[-1].strip()
+        if address:
+            return address
+    return request.META.get('REMOTE_ADDR')
+
+
+def get_wait(request, view_name):
+    """
+        Seconds until the request may go through, 0 when it may now. The IP address is checked first,
+        it does not need the session and the user to be loaded.
+    """
+    rates = settings.THROTTLE_RATES.get(view_name, {})
+    buckets = get_buckets()
+    wait = take(buckets, view_name, 'ip', get_client_ip(request), rates.get('ip'))
+    if not wait and rates.get('user') and request.user.is_authenticated:
+        wait = take(buckets, view_name, 'user', request.user.pk, rates['user'])
+    return wait
+
+
+def too_many_requests(wait):
+    seconds = math.ceil(wait)
+    response = HttpResponse(
+        'Too many requests, please try again in {} seconds.'.format(seconds),
+        content_type='text/plain', status=429
+    )
+    response['Retry-After'] = str(seconds)
+    return response
+
+
+def throttle(view_name):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method == 'POST':
+                wait = get_wait(request, view_name)
+                if wait:
+                    return too_many_requests(wait)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,73 @@
+"""
+    The JSONL format of `export_forum` and `import_forum`: one `{"model": ..., "fields": {...}}` object per line,
+    boards first, then topics, then posts, each in primary key order so every row only refers to rows above it.
+    Users are not part of the dump, they have to exist with the same primary keys before importing.
+    Denormalized columns (counters, `last_post`, `message_html`) are left out and rebuilt after an import.
+"""
+import gzip
+import io
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+
+from .models import Board, Post, Topic
+
+MODELS = OrderedDict([
+    ('board', (Board, ('id', 'name', 'description'))),
+    ('topic', (Topic, ('id', 'subject', 'last_updated', 'board_id', 'starter_id', 'views'))),
+    ('post', (Post, ('id', 'message', 'topic_id', 'created_at', 'updated_at', 'created_by_id', 'updated_by_id'))),
+])
+
+
+def open_dump(path, mode):
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, mode + 'b'), encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class DumpEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # `DjangoJSONEncoder` drops the microseconds, which the topic list cursors depend on
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+@contextmanager
+def keep_timestamps():
+    """
+        `auto_now_add` fields are set to the current time on insert, even by `bulk_create`.
+        Switch it off so the imported creation times are kept.
+    """
+    fields = [
+        field
+        for model, _ in MODELS.values()
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def format_rate(label, count, started):
+    elapsed = time.perf_counter() - started
+    return '{} {} rows in {:.1f}s ({:.0f} rows/s)'.format(label, count, elapsed, count / max(elapsed, 1e-6))
+
+
+def reset_sequences(models):
+    # Rows inserted with explicit primary keys leave the sequences behind them (PostgreSQL)
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
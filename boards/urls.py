@@ -14,14 +14,17 @@ Including another URLconf
     2. Add a URL to urlpatterns:  url(r'^blog/', include('blog.urls'))
 """
 from django.conf.urls import url
-from . import views
+from . import feeds, views
 
 app_name = 'boards'
 urlpatterns = [
     url(r'^$', views.BoardListView.as_view(), name='home'),
+    url(r'^search/$', views.SearchView.as_view(), name='search'),
     url(r'^boards/(?P<pk>\d+)/$', views.TopicListView.as_view(), name='board_topics'),
+    url(r'^boards/(?P<pk>\d+)/feed/$', feeds.board_feed, name='board_feed'),
     url(r'^boards/(?P<pk>\d+)/new/$', views.new_topic, name='new_topic'),
     url(r'^boards/(?P<board_pk>\d+)/topics/(?P<topic_pk>\d+)/$', views.PostListView.as_view(), name='topic_posts'),
+    url(r'^boards/(?P<board_pk>\d+)/topics/(?P<topic_pk>\d+)/feed/$', feeds.topic_feed, name='topic_feed'),
     url(r'^boards/(?P<board_pk>\d+)/topics/(?P<topic_pk>\d+)/reply/$', views.reply_topic, name='reply_topic'),
     url(r'^boards/(?P<board_pk>\d+)/topics/(?P<topic_pk>\d+)/posts/(?P<post_pk>\d+)/edit/$',
         views.PostUpdateView.as_view(), name='edit_post'),
@@ -1,24 +1,39 @@
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Count
+from django.db.models import F
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import condition
 from django.views.generic import UpdateView, ListView
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.urls import reverse
+from django.utils.http import urlencode
 
+from .conditional import board_etag, board_last_modified, topic_etag, topic_last_modified
+from .counters import ViewedTopics, view_counter
 from .forms import NewTopicForm, PostReplyForm
 from .models import Board, Post, Topic
+from .pagination import InvalidCursor, KeysetPaginator
+from .replicas import ReplicaReadsMixin, pin_to_primary
+from .search import SearchResults
+from .throttling import throttle
 
 
-class BoardListView(ListView):
+class BoardListView(ReplicaReadsMixin, ListView):
     model = Board
     context_object_name = 'boards'
     template_name = 'boards/home.html'
 
+    def get_queryset(self):
+        return Board.objects.select_related('last_post__created_by')
+
 
-class TopicListView(ListView):
+@method_decorator(condition(etag_func=board_etag, last_modified_func=board_last_modified), name='dispatch')
+class TopicListView(ReplicaReadsMixin, ListView):
     model = Topic
     context_object_name = 'topics'
     template_name = 'boards/topics.html'
@@ -26,35 +41,81 @@ class TopicListView(ListView):
 
     def get_context_data(self, **kwargs):
         kwargs['board'] = self.board
-        return super().get_context_data(**kwargs)
+        context = super().get_context_data(**kwargs)
+        context['keyset_paginated'] = isinstance(context['paginator'], KeysetPaginator)
+        return context
 
     def get_queryset(self):
         self.board = get_object_or_404(Board, pk=self.kwargs.get('pk'))
-        queryset = self.board.topics.order_by('-last_updated').annotate(replies=Count('posts') - 1)
+        queryset = self.board.topics.select_related('starter').order_by('-last_updated', '-pk') \
+            .annotate(replies=F('posts_count') - 1)
         return queryset
 
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, orphans, allow_empty_first_page, **kwargs)
+        # The board keeps its topics count up to date, there is no need for a COUNT(*) query
+        paginator.count = self.board.topics_count
+        return paginator
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, 'last_updated', count=self.board.topics_count)
+        try:
+            page = paginator.page(after=self.request.GET.get('after'), before=self.request.GET.get('before'))
+        except InvalidCursor:
+            raise Http404('Invalid cursor')
+        return paginator, page, page.object_list, page.has_other_pages()
 
-class PostListView(ListView):
+
+@method_decorator(condition(etag_func=topic_etag, last_modified_func=topic_last_modified), name='dispatch')
+class PostListView(ReplicaReadsMixin, ListView):
     model = Post
     context_object_name = 'posts'
     template_name = 'boards/topic_posts.html'
     paginate_by = 20
 
     def get_context_data(self, **kwargs):
-        session_key = f'viewed_topic_{self.topic.pk}'
-        if not self.request.session.get(session_key, False):
-            self.topic.views += 1
-            self.topic.save()
-            self.request.session[session_key] = True
+        if ViewedTopics(self.request.session).add(self.topic.pk):
+            view_counter.hit(self.topic.pk)
 
         kwargs['topic'] = self.topic
+        kwargs['post_cache_timeout'] = settings.POST_CACHE_TIMEOUT
+        kwargs['post_cache_version'] = settings.POST_CACHE_VERSION
         return super().get_context_data(**kwargs)
 
     def get_queryset(self):
-        self.topic = get_object_or_404(Topic, board__pk=self.kwargs.get('board_pk'), pk=self.kwargs.get('topic_pk'))
-        queryset = self.topic.posts.order_by('created_at')
+        self.topic = get_object_or_404(
+            Topic.objects.select_related('board'),
+            board__pk=self.kwargs.get('board_pk'),
+            pk=self.kwargs.get('topic_pk')
+        )
+        # The authors and their post totals for the whole page come with the posts query
+        queryset = self.topic.posts.select_related('created_by__profile').order_by('created_at')
         return queryset
 
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        paginator = super().get_paginator(queryset, per_page, orphans, allow_empty_first_page, **kwargs)
+        paginator.count = self.topic.posts_count
+        return paginator
+
+
+class SearchView(ListView):
+    context_object_name = 'posts'
+    template_name = 'boards/search.html'
+    paginate_by = 20
+
+    def get_context_data(self, **kwargs):
+        kwargs['query'] = self.query
+        # Keeps the query in the pagination links
+        kwargs['querystring'] = urlencode({'q': self.query}) + '&' if self.query else ''
+        return super().get_context_data(**kwargs)
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return SearchResults(self.query)
+
 # def topic_posts(request, board_pk, topic_pk):
 #     topic = get_object_or_404(Topic, board__pk=board_pk, pk=topic_pk)
 #     topic.views += 1
@@ -62,40 +123,47 @@ class PostListView(ListView):
 #     return render(request, 'boards/topic_posts.html', {'topic': topic})
 
 
+@throttle('new_topic')
 @login_required
+@pin_to_primary
 def new_topic(request, pk):
     board = get_object_or_404(Board, pk=pk)
     if request.method == 'POST':
         form = NewTopicForm(request.POST)
         if form.is_valid():
-            topic = form.save(commit=False)
-            topic.board = board
-            topic.starter = request.user
-            topic.save()
-            Post.objects.create(
-                message=form.cleaned_data.get('message'),
-                topic=topic,
-                created_by=request.user
-            )
+            with transaction.atomic():
+                topic = form.save(commit=False)
+                topic.board = board
+                topic.starter = request.user
+                topic.save()
+                Post.objects.create(
+                    message=form.cleaned_data.get('message'),
+                    topic=topic,
+                    created_by=request.user
+                )
             return redirect('boards:topic_posts', board_pk=pk, topic_pk=topic.pk)
     else:
         form = NewTopicForm()
     return render(request, 'boards/new_topic.html', {'board': board, 'form': form})
 
 
+@throttle('reply_topic')
 @login_required
+@pin_to_primary
 def reply_topic(request, board_pk, topic_pk):
-    topic = get_object_or_404(Topic, board__pk=board_pk, pk=topic_pk)
+    topic = get_object_or_404(Topic.objects.select_related('board'), board__pk=board_pk, pk=topic_pk)
     if request.method == 'POST':
         form = PostReplyForm(request.POST)
         if form.is_valid():
             post = form.save(commit=False)
             post.topic = topic
             post.created_by = request.user
-            post.save()
-
-            topic.last_updated = timezone.now()
-            topic.save()
+            # The signals move the topic's `last_updated` and counters forward in the same transaction
+            with transaction.atomic():
+                post.save()
+            # The stored count was incremented with an F() expression, keep the loaded topic in step
+            # instead of reading it back to find the last page
+            topic.posts_count += 1
 
             topic_url = reverse('boards:topic_posts', kwargs={'board_pk': board_pk, 'topic_pk': topic_pk})
             topic_post_url = '{url}?page={page}#{id}'.format(
@@ -110,7 +178,7 @@ def reply_topic(request, board_pk, topic_pk):
     return render(request, 'boards/reply_topic.html', {'topic': topic, 'form': form})
 
 
-@method_decorator(login_required, name='dispatch')
+@method_decorator([login_required, pin_to_primary], name='dispatch')
 class PostUpdateView(UpdateView):
     model = Post
     fields = ('message', )
@@ -119,7 +187,7 @@ class PostUpdateView(UpdateView):
     context_object_name = 'post'
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('topic__board')
         return queryset.filter(created_by=self.request.user)
 
     def form_valid(self, form):
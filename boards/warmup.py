@@ -0,0 +1,70 @@
+"""
+    Work a fresh worker would otherwise do on its first requests: compiling the templates, the URL patterns and
+    the markdown pipeline. `myproject.wsgi` runs `warm_up` once per process when `WARM_UP` is on.
+"""
+import logging
+import os
+import time
+
+from django.apps import apps
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+from .rendering import render_markdown
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_APPS = ('boards', 'accounts')
+
+
+def get_template_names(app_label):
+    directory = os.path.join(apps.get_app_config(app_label).path, 'templates')
+    for root, _, files in os.walk(directory):
+        for name in files:
+            yield os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+
+
+def load_templates():
+    """
+        With `DEBUG` off Django 1.11 wraps the template loaders in the cached loader, every template loaded
+        here is compiled once and kept for the life of the process.
+    """
+    count = 0
+    for app_label in WARM_UP_APPS:
+        for name in get_template_names(app_label):
+            try:
+                get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError):
+                logger.exception('Could not warm up template %s', name)
+            else:
+                count += 1
+    return count
+
+
+def compile_urls(resolver=None):
+    """
+        Compile the regex of every URL pattern and build the reverse lookup tables,
+        both of which Django does lazily on the first `resolve()` and `reverse()`.
+    """
+    resolver = resolver or get_resolver()
+    count = 0
+    for pattern in resolver.url_patterns:
+        pattern.regex
+        count += 1
+        if hasattr(pattern, 'url_patterns'):
+            count += compile_urls(pattern)
+    resolver.reverse_dict
+    return count
+
+
+def warm_up():
+    started = time.perf_counter()
+    templates = load_templates()
+    urls = compile_urls()
+    # Imports the markdown package and builds the renderer
+    render_markdown('Warm *up*')
+    logger.info(
+        'Warmed up %d templates and %d URL patterns in %.0fms', templates, urls, (time.perf_counter() - started) * 1000
+    )
+    return templates, urls
@@ -43,11 +43,13 @@ INSTALLED_APPS = [
 
     'widget_tweaks',
 
-    'boards',
-    'accounts',
+    'boards.apps.BoardsConfig',
+    'accounts.apps.AccountsConfig',
 ]
 
 MIDDLEWARE = [
+    'boards.profiling.ProfilingMiddleware',
+    'boards.fingerprints.QueryFingerprintMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,18 +79,61 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'myproject.wsgi.application'
 
+# Compile the templates, URL patterns and markdown renderer when a worker loads the WSGI application instead
+# of on its first requests
+
+WARM_UP = config('WARM_UP', default=True, cast=bool)
+
 
 # Database
 # https://docs.djangoproject.com/en/1.11/ref/settings/#databases
 
+# Every thread keeps its database connections open for CONN_MAX_AGE seconds (0 closes them after each request)
+# and pings them before a request reuses them when CONN_HEALTH_CHECKS is on, once they have been idle for
+# CONN_HEALTH_CHECK_INTERVAL seconds
+
+CONN_MAX_AGE = config('CONN_MAX_AGE', default=60, cast=int)
+
+CONN_HEALTH_CHECKS = config('CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+CONN_HEALTH_CHECK_INTERVAL = config('CONN_HEALTH_CHECK_INTERVAL', default=10, cast=int)
+
 DATABASES = {
     'default': dj_database_url.config(
-        default=config('DATABASE_URL')
+        default=config('DATABASE_URL'),
+        conn_max_age=CONN_MAX_AGE
     )
 }
 # 'ENGINE': 'django.db.backends.sqlite3',
         # 'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
 
+# Optional read replicas (comma separated URLs) for the board, topic and post lists. A browser reads from the
+# primary for REPLICA_PIN_SECONDS after posting, so nobody misses their own posts while the replicas catch up
+
+REPLICA_DATABASES = []
+
+for number, url in enumerate(config('REPLICA_DATABASE_URL', default='', cast=Csv()), 1):
+    alias = 'replica_{}'.format(number)
+    DATABASES[alias] = dj_database_url.parse(url, conn_max_age=CONN_MAX_AGE)
+    # The test database of a replica is the primary's, like a replica without any lag
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['boards.replicas.ReplicaRouter']
+
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/1.11/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
@@ -136,4 +181,89 @@ LOGIN_REDIRECT_URL = 'boards:home'
 LOGOUT_REDIRECT_URL = 'boards:home'
 
 
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+
+# Markdown renderer of post messages, one of: markdown, markdown_cached, mistune (needs mistune 0.8)
+# Run `manage.py render_posts` after changing it to re-render the stored HTML
+
+MARKDOWN_RENDERER = config('MARKDOWN_RENDERER', default='markdown')
+
+
+# Topic views are buffered in every process and written at most VIEW_COUNTER_FLUSH_INTERVAL seconds after
+# they were counted, busy or idle, or as soon as VIEW_COUNTER_MAX_PENDING views are waiting
+
+VIEW_COUNTER_FLUSH_INTERVAL = config('VIEW_COUNTER_FLUSH_INTERVAL', default=10, cast=int)
+
+VIEW_COUNTER_MAX_PENDING = config('VIEW_COUNTER_MAX_PENDING', default=100, cast=int)
+
+# Views and query fingerprints are also flushed when the process exits, the test runner drops those counted
+# against the test databases before destroying them
+
+TEST_RUNNER = 'boards.tests.runner.TestRunner'
+
+
+# A session counts a topic view once per VIEWED_TOPICS_MAX_AGE seconds (up to twice that), remembered in
+# two Bloom filters of VIEWED_TOPICS_BITS bits each (a multiple of 8)
+
+VIEWED_TOPICS_BITS = config('VIEWED_TOPICS_BITS', default=8192, cast=int)
+
+VIEWED_TOPICS_MAX_AGE = config('VIEWED_TOPICS_MAX_AGE', default=86400, cast=int)
+
+
+# Rendered post bodies are cached per post, `updated_at` and author name, avatars per author and email hash.
+# Bump POST_CACHE_VERSION to drop all of them at once, e.g. after changing MARKDOWN_RENDERER or the markup
+
+POST_CACHE_TIMEOUT = config('POST_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+POST_CACHE_VERSION = config('POST_CACHE_VERSION', default=1, cast=int)
+
+
+# Board and topic feeds are cached under their ETag, which changes with every write, so the timeout only
+# decides how long unreachable copies linger
+
+FEED_CACHE_TIMEOUT = config('FEED_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+
+# A PROFILING_SAMPLE_RATE fraction of the requests (0 to 1), and those with a signed `X-Profile` header younger than
+# PROFILING_HEADER_MAX_AGE seconds, run under cProfile. Merge the dumps with `manage.py profile_report`
+
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0, cast=float)
+
+PROFILING_HEADER_MAX_AGE = config('PROFILING_HEADER_MAX_AGE', default=60 * 60, cast=int)
+
+PROFILING_DIRECTORY = config('PROFILING_DIRECTORY', default=os.path.join(BASE_DIR, 'profiles'))
+
+
+# With SQL_FINGERPRINTS on, the queries of every request are counted per URL name and SQL fingerprint, written
+# every SQL_FINGERPRINT_FLUSH_INTERVAL seconds. More than SQL_FINGERPRINT_REPEAT_THRESHOLD runs in a request is an N+1
+
+SQL_FINGERPRINTS = config('SQL_FINGERPRINTS', default=False, cast=bool)
+
+SQL_FINGERPRINT_REPEAT_THRESHOLD = config('SQL_FINGERPRINT_REPEAT_THRESHOLD', default=5, cast=int)
+
+SQL_FINGERPRINT_FLUSH_INTERVAL = config('SQL_FINGERPRINT_FLUSH_INTERVAL', default=60, cast=int)
+
+
+# POSTs creating topics and replies are limited per IP address and per user to THROTTLE_RATES, `<requests>/<period>`
+# with a period of s, m, h, d or seconds, empty for no limit. The buckets are kept by every process, or in the
+# THROTTLE_CACHE cache of CACHES to share them between processes
+
+THROTTLE_RATES = {
+    'new_topic': {
+        'ip': config('THROTTLE_NEW_TOPIC_IP_RATE', default='20/m'),
+        'user': config('THROTTLE_NEW_TOPIC_USER_RATE', default='5/m'),
+    },
+    'reply_topic': {
+        'ip': config('THROTTLE_REPLY_TOPIC_IP_RATE', default='60/m'),
+        'user': config('THROTTLE_REPLY_TOPIC_USER_RATE', default='15/m'),
+    },
+}
+
+THROTTLE_CACHE = config('THROTTLE_CACHE', default='')
+
+# Behind a proxy or load balancer REMOTE_ADDR is the proxy's address, shared by every client. THROTTLE_IP_HEADER
+# names the META key of the header it sets instead, e.g. HTTP_X_FORWARDED_FOR, of which the last address is used.
+# Requests without the header are limited by REMOTE_ADDR
+
+THROTTLE_IP_HEADER = config('THROTTLE_IP_HEADER', default='')
@@ -16,10 +16,13 @@ Including another URLconf
 from django.conf.urls import url, include
 from django.contrib import admin
 
+from boards.connections import connection_stats_view
+
 urlpatterns = [
     url(r'', include('boards.urls')),
     url(r'', include('accounts.urls')),
     # url(r'', include('django.contrib.auth.urls')),
     # url('^accounts/', include('django.contrib.auth.urls')),
     url(r'^admin/', admin.site.urls),
+    url(r'^debug/connections/$', connection_stats_view, name='connection_stats'),
 ]